@@ -1,20 +1,47 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import time
+import numpy as np
 import logging
-from typing import Optional, Dict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import TYPE_CHECKING, Optional, Dict
 
 # Import our custom modules
 from config import Config
 from yfinance_client import YahooFinanceClient
-from chart_utils import ChartCreator
+
+# plotly (via chart_utils) is imported lazily inside the chart builders so a
+# cold start does not pay for it until the first chart is drawn
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def ui_safe(msg: str):
+    """
+    Log and display any exception raised by the decorated UI method.
+    
+    Args:
+        msg: Message shown to the user and logged alongside the traceback
+    
+    Returns:
+        Decorator; the wrapped call returns None when an exception is caught
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.exception(msg)
+                st.error(f"{msg}: {e}")
+                return None
+        return wrapper
+    return decorator
+
 # Page configuration
 st.set_page_config(
     page_title="Stock Analyzer & Predictor - Professional Edition",
@@ -23,60 +50,197 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    .prediction-card {
-        background-color: #fff3cd;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #ffc107;
-    }
-    .error-card {
-        background-color: #f8d7da;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #dc3545;
-    }
-    .success-card {
-        background-color: #d4edda;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #28a745;
-    }
-    .stock-info {
-        background-color: #e3f2fd;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #2196f3;
-        margin-bottom: 1rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Header styling is inlined on the one element that uses it, so no separate
+# <style> block has to be re-sent to the browser on every rerun
+MAIN_HEADER_STYLE = "font-size: 2.5rem; font-weight: bold; color: #1f77b4; text-align: center; margin-bottom: 2rem;"
+
+@st.cache_resource
+def get_yf_client() -> YahooFinanceClient:
+    """Return a Yahoo Finance client shared across reruns and sessions."""
+    return YahooFinanceClient()
+
+def _df_key(df: pd.DataFrame) -> bytes:
+    """Return a cheap content key for a DataFrame, used to key cached artefacts."""
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes()
+
+# Cached data access. Streamlit reruns the whole script on every widget
+# interaction, so network calls are memoized across reruns.
+@st.cache_data(ttl=Config.MARKET_DATA_CACHE_TTL, show_spinner=False)
+def _cached_stock_info(symbol: str) -> Dict:
+    """
+    Fetch stock information, cached across reruns.
+    
+    Raises ValueError when no information is returned so that failures are not cached.
+    """
+    info = get_yf_client().get_stock_info(symbol)
+    if info is None:
+        raise ValueError(f"Failed to fetch stock information for {symbol}")
+    return info
+
+@st.cache_data(ttl=Config.MARKET_DATA_CACHE_TTL, show_spinner=False)
+def _cached_historical(symbol: str, days: int) -> pd.DataFrame:
+    """
+    Fetch historical data with indicators, cached across reruns.
+    
+    Raises ValueError when no data is returned so that failures are not cached.
+    """
+    df = get_yf_client().get_historical_data(symbol, days)
+    if df is None:
+        raise ValueError(f"Failed to fetch historical data for {symbol}")
+    return df
+
+@st.cache_data(ttl=Config.LIVE_PRICE_CACHE_TTL, show_spinner=False)
+def _cached_live_price(symbol: str) -> Dict:
+    """
+    Fetch live price data, cached for a short period.
+    
+    Raises ValueError when no price is returned so that failures are not cached.
+    """
+    live_price = get_yf_client().get_live_price(symbol)
+    if live_price is None:
+        raise ValueError(f"Failed to fetch live price for {symbol}")
+    return live_price
+
+def _live_price_or_none(symbol: str) -> Optional[Dict]:
+    """Return the cached live price, or None when it cannot be fetched."""
+    try:
+        return _cached_live_price(symbol)
+    except ValueError:
+        return None
+
+@st.cache_data(ttl=Config.MARKET_DATA_CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: _df_key})
+def _cached_prediction(df: pd.DataFrame) -> Dict:
+    """Generate the next-day prediction, cached on the historical data contents."""
+    return get_yf_client().predict_next_day(df)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _market_status() -> Dict:
+    """Return the market status, shared across reruns for a short period."""
+    return get_yf_client().get_market_status()
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _grouped_popular() -> Dict[str, list]:
+    """Return the popular stocks grouped by exchange."""
+    grouped = defaultdict(list)
+    for stock in get_yf_client().get_popular_stocks():
+        grouped[stock['exchange']].append(stock)
+    return dict(grouped)
+
+# Thresholds for compact money formatting, largest first
+_SCALES = ((1e12, 'T'), (1e9, 'B'), (1e6, 'M'))
+
+def _format_money(value: float, currency: Optional[str], compact: bool = False) -> str:
+    """
+    Format an amount with the symbol for its currency.
+    
+    Args:
+        value: Amount to format
+        currency: Currency code; anything other than USD is shown in rupees
+        compact: Scale large amounts to T/B/M (used for market cap)
+    
+    Returns:
+        Formatted money string
+    """
+    prefix = "$" if currency == 'USD' else "₹"
+    if not compact:
+        return f"{prefix}{value:,.2f}"
+    for threshold, suffix in _SCALES:
+        if value >= threshold:
+            return f"{prefix}{value / threshold:.2f}{suffix}"
+    return f"{prefix}{value:,.0f}"
+
+# Indicator overlays longer than this are downsampled before charting
+OVERLAY_MAX_POINTS = 400
+
+def _lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick the row positions that Largest-Triangle-Three-Buckets keeps.
+    
+    Args:
+        y: Series values, assumed evenly spaced
+        n_out: Number of points to keep
+    
+    Returns:
+        Sorted array of row positions, always including the first and last
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.arange(n, dtype=float)
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick
+        # and the average of the next bucket
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    
+    return kept
+
+def _overlay_frame(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Return a downsampled copy of df for the indicator overlays, or None."""
+    if len(df) <= OVERLAY_MAX_POINTS:
+        return None
+    # Buckets are chosen on the close so the overlays keep the price's shape
+    return df.iloc[_lttb_indices(df['close'].to_numpy(dtype=float), OVERLAY_MAX_POINTS)]
+
+# Figures are keyed on the data key; the DataFrame itself is passed as an
+# underscore-prefixed argument so Streamlit does not hash it again. Figures are
+# read-only once built, so cache_resource hands back the same object instead of
+# unpickling a copy on every rerun.
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _make_candles(df_key: bytes, _df: pd.DataFrame, symbol: str) -> "go.Figure":
+    """Build the candlestick chart for the given data."""
+    from chart_utils import ChartCreator
+    return ChartCreator.create_candlestick_chart(
+        _df, symbol, overlay_df=_overlay_frame(_df)
+    )
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _make_indicators(df_key: bytes, _df: pd.DataFrame, symbol: str) -> "go.Figure":
+    """Build the technical indicators chart for the given data."""
+    from chart_utils import ChartCreator
+    return ChartCreator.create_technical_indicators_chart(_df, symbol)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _make_prediction(df_key: bytes, _df: pd.DataFrame, prediction_data: Dict, symbol: str) -> "go.Figure":
+    """Build the prediction chart for the given data and prediction."""
+    from chart_utils import ChartCreator
+    return ChartCreator.create_prediction_chart(_df, prediction_data, symbol)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _df_to_csv(df_key: bytes, _df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV bytes for the download button."""
+    return _df.to_csv().encode()
 
 class StockAnalyzerApp:
     """Main application class for the Stock Analyzer."""
     
     def __init__(self):
         """Initialize the application."""
-        self.yf_client = YahooFinanceClient()
+        self.yf_client = get_yf_client()
         self.current_data = None
         self.live_price_data = None
         self.prediction_data = None
         self.stock_info = None
+        self._price_slot = None
+        self._prediction_slot = None
+        self._chart_slot = None
+        self._table_slot = None
         
         # Initialize session state
         if 'current_symbol' not in st.session_state:
@@ -86,7 +250,7 @@ class StockAnalyzerApp:
     
     def render_header(self):
         """Render the main header."""
-        st.markdown('<h1 class="main-header">📈 Stock Analyzer & Predictor</h1>', unsafe_allow_html=True)
+        st.markdown(f'<h1 style="{MAIN_HEADER_STYLE}">📈 Stock Analyzer & Predictor</h1>', unsafe_allow_html=True)
         st.markdown("---")
         
         # Data source info
@@ -96,71 +260,61 @@ class StockAnalyzerApp:
         """Render the sidebar with controls."""
         st.sidebar.title("⚙️ Controls")
         
-        # Stock symbol input with search
-        symbol = st.sidebar.text_input(
-            "Stock Symbol",
-            value=st.session_state.current_symbol,
-            placeholder="e.g., RELIANCE.NS, AAPL, MSFT",
-            help="Enter stock symbol (e.g., RELIANCE.NS for NSE, AAPL for NASDAQ)"
-        )
+        # Inputs are batched in a form so typing a symbol or dragging the
+        # slider only triggers a rerun (and a fetch) when submitted
+        with st.sidebar.form("controls"):
+            # Stock symbol input with search
+            symbol = st.text_input(
+                "Stock Symbol",
+                value=st.session_state.current_symbol,
+                placeholder="e.g., RELIANCE.NS, AAPL, MSFT",
+                help="Enter stock symbol (e.g., RELIANCE.NS for NSE, AAPL for NASDAQ)"
+            )
+            
+            # Historical data days
+            days = st.slider(
+                "Historical Data (Days)",
+                min_value=30,
+                max_value=365,
+                value=st.session_state.historical_days,
+                help="Number of days of historical data to analyze"
+            )
+            
+            submitted = st.form_submit_button("Analyze", type="primary")
+        
+        # Update session state; the submit itself is the rerun
+        if submitted:
+            st.session_state.current_symbol = symbol
+            st.session_state.historical_days = days
         
         # Quick stock selection
         st.sidebar.markdown("### 🚀 Quick Select")
-        popular_stocks = self.yf_client.get_popular_stocks()
-        
-        # Group by exchange
-        nse_stocks = [s for s in popular_stocks if s['exchange'] == 'NSE']
-        nasdaq_stocks = [s for s in popular_stocks if s['exchange'] == 'NASDAQ']
-        
-        if nse_stocks:
-            st.sidebar.markdown("**🇮🇳 Indian Stocks (NSE)**")
-            for stock in nse_stocks[:5]:
-                if st.sidebar.button(f"{stock['name']} ({stock['symbol']})", key=f"btn_{stock['symbol']}"):
-                    symbol = stock['symbol']
-        
-        if nasdaq_stocks:
-            st.sidebar.markdown("**🇺🇸 US Stocks (NASDAQ)**")
-            for stock in nasdaq_stocks[:5]:
-                if st.sidebar.button(f"{stock['name']} ({stock['symbol']})", key=f"btn_{stock['symbol']}"):
-                    symbol = stock['symbol']
-        
-        # Historical data days
-        days = st.sidebar.slider(
-            "Historical Data (Days)",
-            min_value=30,
-            max_value=365,
-            value=st.session_state.historical_days,
-            help="Number of days of historical data to analyze"
+        grouped_stocks = _grouped_popular()
+        nse_stocks = grouped_stocks.get('NSE', [])
+        nasdaq_stocks = grouped_stocks.get('NASDAQ', [])
+        
+        quick_stocks = nse_stocks[:5] + nasdaq_stocks[:5]
+        flags = {'NSE': '🇮🇳', 'NASDAQ': '🇺🇸'}
+        labels = {
+            stock['symbol']: f"{flags.get(stock['exchange'], '')} {stock['name']} ({stock['symbol']})"
+            for stock in quick_stocks
+        }
+        
+        # One radio instead of a button per stock; the callback runs before the
+        # rerun, so the new symbol is picked up without an extra st.rerun()
+        st.sidebar.radio(
+            "Quick select",
+            options=list(labels),
+            format_func=labels.get,
+            index=None,
+            key="quick_select",
+            label_visibility="collapsed",
+            on_change=self._on_quick_select
         )
         
-        # Update session state
-        if symbol != st.session_state.current_symbol:
-            st.session_state.current_symbol = symbol
-            st.session_state.historical_days = days
-            st.rerun()
-        
         # Market status
-        try:
-            market_status = self.yf_client.get_market_status()
-            st.sidebar.markdown("### 📊 Market Status")
-            
-            if market_status.get('is_open'):
-                st.sidebar.success("🟢 Market Open")
-            else:
-                st.sidebar.warning("🔴 Market Closed")
-            
-            st.sidebar.text(f"Time: {market_status.get('current_time', 'N/A')}")
-            st.sidebar.text(f"Date: {market_status.get('current_date', 'N/A')}")
-            st.sidebar.text(f"Open: {market_status.get('market_open', 'N/A')}")
-            st.sidebar.text(f"Close: {market_status.get('market_close', 'N/A')}")
-            st.sidebar.text(f"TZ: {market_status.get('timezone', 'N/A')}")
-            
-        except Exception as e:
-            st.sidebar.error(f"Error getting market status: {e}")
-        
-        # Refresh button
-        if st.sidebar.button("🔄 Refresh Data", type="primary"):
-            st.rerun()
+        with st.sidebar:
+            self._market_panel()
         
         # About section
         st.sidebar.markdown("---")
@@ -181,34 +335,97 @@ class StockAnalyzerApp:
         - **Japan**: 7203.T, 9984.T
         """)
     
+    @staticmethod
+    def _on_quick_select():
+        """Make the quick-select choice the current symbol."""
+        choice = st.session_state.quick_select
+        if choice:
+            st.session_state.current_symbol = choice
+            # Clear the radio so picking the same stock again still fires on_change
+            st.session_state.quick_select = None
+    
+    @ui_safe("Error getting market status")
+    def _market_panel(self):
+        """Render the market status panel."""
+        market_status = _market_status()
+        st.markdown("### 📊 Market Status")
+        
+        if market_status.get('is_open'):
+            st.success("🟢 Market Open")
+        else:
+            st.warning("🔴 Market Closed")
+        
+        st.text(f"Time: {market_status.get('current_time', 'N/A')}")
+        st.text(f"Date: {market_status.get('current_date', 'N/A')}")
+        st.text(f"Open: {market_status.get('market_open', 'N/A')}")
+        st.text(f"Close: {market_status.get('market_close', 'N/A')}")
+        st.text(f"TZ: {market_status.get('timezone', 'N/A')}")
+    
+    def refresh_data(self) -> bool:
+        """Drop the cached data for the current selection and fetch it again."""
+        symbol = st.session_state.current_symbol
+        days = st.session_state.historical_days
+        st.session_state.pop('data_snapshot', None)
+        _cached_stock_info.clear(symbol)
+        _cached_live_price.clear(symbol)
+        _cached_historical.clear(symbol, days)
+        return self.fetch_stock_data(symbol, days)
+    
+    @ui_safe("Error fetching data")
     def fetch_stock_data(self, symbol: str, days: int) -> bool:
         """Fetch stock data and update the application state."""
-        try:
+        # Reruns with unchanged inputs reuse this session's data; only the
+        # live price is re-read, through its own short-lived cache
+        key = (symbol, days)
+        snapshot = st.session_state.get('data_snapshot')
+        if snapshot is not None and snapshot['key'] == key:
+            self.stock_info = snapshot['stock_info']
+            self.current_data = snapshot['current_data']
+            self.prediction_data = snapshot['prediction_data']
+            self.live_price_data = _live_price_or_none(symbol)
+        else:
             with st.spinner(f"Fetching data for {symbol}..."):
-                # Get stock information
-                self.stock_info = self.yf_client.get_stock_info(symbol)
+                # The three Yahoo endpoints are independent, so fetch them concurrently
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    info_future = executor.submit(_cached_stock_info, symbol)
+                    historical_future = executor.submit(_cached_historical, symbol, days)
+                    live_price_future = executor.submit(_cached_live_price, symbol)
+                
+                # Get stock information; the page still renders without it
+                try:
+                    self.stock_info = info_future.result()
+                except ValueError:
+                    self.stock_info = None
                 
                 # Get historical data
-                self.current_data = self.yf_client.get_historical_data(symbol, days)
-                if self.current_data is None:
-                    st.error(f"Failed to fetch historical data for {symbol}")
+                try:
+                    self.current_data = historical_future.result()
+                except ValueError as e:
+                    st.error(str(e))
                     return False
                 
                 # Get live price data
-                self.live_price_data = self.yf_client.get_live_price(symbol)
-                if self.live_price_data is None:
-                    st.warning(f"Failed to fetch live price for {symbol}")
+                try:
+                    self.live_price_data = live_price_future.result()
+                except ValueError:
+                    self.live_price_data = None
                 
                 # Generate prediction
-                self.prediction_data = self.yf_client.predict_next_day(self.current_data)
-                
-                return True
-                
-        except Exception as e:
-            st.error(f"Error fetching data: {e}")
-            logger.error(f"Error in fetch_stock_data: {e}")
-            return False
+                self.prediction_data = _cached_prediction(self.current_data)
+            
+            st.session_state.data_snapshot = {
+                'key': key,
+                'stock_info': self.stock_info,
+                'current_data': self.current_data,
+                'prediction_data': self.prediction_data
+            }
+        
+        if self.live_price_data is None:
+            st.warning(f"Failed to fetch live price for {symbol}")
+        
+        return True
     
+    @ui_safe("Error rendering stock information")
     def render_stock_info(self):
         """Render stock information section."""
         if self.stock_info is None:
@@ -230,15 +447,7 @@ class StockAnalyzerApp:
         
         with col3:
             if self.stock_info['market_cap']:
-                market_cap = self.stock_info['market_cap']
-                if market_cap >= 1e12:
-                    market_cap_str = f"${market_cap/1e12:.2f}T"
-                elif market_cap >= 1e9:
-                    market_cap_str = f"${market_cap/1e9:.2f}B"
-                elif market_cap >= 1e6:
-                    market_cap_str = f"${market_cap/1e6:.2f}M"
-                else:
-                    market_cap_str = f"${market_cap:,.0f}"
+                market_cap_str = _format_money(self.stock_info['market_cap'], self.stock_info['currency'], compact=True)
                 st.markdown(f"**Market Cap**: {market_cap_str}")
             else:
                 st.markdown("**Market Cap**: N/A")
@@ -246,6 +455,7 @@ class StockAnalyzerApp:
             if self.stock_info['website']:
                 st.markdown(f"**Website**: [{self.stock_info['website']}]({self.stock_info['website']})")
     
+    @ui_safe("Error rendering price summary")
     def render_price_summary(self):
         """Render the price summary section."""
         if self.live_price_data is None:
@@ -253,54 +463,46 @@ class StockAnalyzerApp:
         
         st.markdown("### 💰 Price Summary")
         
+        live = self.live_price_data
+        fmt = lambda value: _format_money(value, live['currency'])
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric(
                 "Current Price",
-                f"${self.live_price_data['last_price']:,.2f}" if self.live_price_data['currency'] == 'USD' else f"₹{self.live_price_data['last_price']:,.2f}",
-                f"{self.live_price_data['change']:+,.2f} ({self.live_price_data['change_percent']:+.2f}%)"
+                fmt(live['last_price']),
+                f"{live['change']:+,.2f} ({live['change_percent']:+.2f}%)"
             )
         
         with col2:
-            st.metric(
-                "Open",
-                f"${self.live_price_data['open']:,.2f}" if self.live_price_data['currency'] == 'USD' else f"₹{self.live_price_data['open']:,.2f}"
-            )
+            st.metric("Open", fmt(live['open']))
         
         with col3:
-            st.metric(
-                "High",
-                f"${self.live_price_data['high']:,.2f}" if self.live_price_data['currency'] == 'USD' else f"₹{self.live_price_data['high']:,.2f}"
-            )
+            st.metric("High", fmt(live['high']))
         
         with col4:
-            st.metric(
-                "Low",
-                f"${self.live_price_data['low']:,.2f}" if self.live_price_data['currency'] == 'USD' else f"₹{self.live_price_data['low']:,.2f}"
-            )
+            st.metric("Low", fmt(live['low']))
         
         # Additional metrics
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric(
-                "Previous Close",
-                f"${self.live_price_data['previous_close']:,.2f}" if self.live_price_data['currency'] == 'USD' else f"₹{self.live_price_data['previous_close']:,.2f}"
-            )
+            st.metric("Previous Close", fmt(live['previous_close']))
         
         with col2:
             st.metric(
                 "Volume",
-                f"{self.live_price_data['volume']:,}"
+                f"{live['volume']:,}"
             )
         
         with col3:
             st.metric(
                 "Last Updated",
-                self.live_price_data['timestamp'].strftime("%H:%M:%S")
+                live['timestamp'].strftime("%H:%M:%S")
             )
     
+    @ui_safe("Error rendering prediction")
     def render_prediction_section(self):
         """Render the prediction section."""
         if self.prediction_data is None:
@@ -308,18 +510,20 @@ class StockAnalyzerApp:
         
         st.markdown("### 🔮 Price Prediction")
         
+        prediction = self.prediction_data['prediction']
+        currency = self.live_price_data['currency'] if self.live_price_data is not None else None
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if isinstance(self.prediction_data['prediction'], (int, float)):
-                currency_symbol = "$" if self.live_price_data is not None and self.live_price_data['currency'] == 'USD' else "₹"
+            if isinstance(prediction, (int, float)):
                 st.metric(
                     "Next Day Prediction",
-                    f"{currency_symbol}{self.prediction_data['prediction']:,.2f}",
-                    f"{self.prediction_data['prediction'] - self.live_price_data['last_price']:+,.2f}"
+                    _format_money(prediction, currency),
+                    f"{prediction - self.live_price_data['last_price']:+,.2f}"
                 )
             else:
-                st.metric("Next Day Prediction", self.prediction_data['prediction'])
+                st.metric("Next Day Prediction", prediction)
         
         with col2:
             st.metric("Trend", self.prediction_data.get('trend', 'N/A'))
@@ -348,6 +552,7 @@ class StockAnalyzerApp:
         Always do your own research and consult with financial professionals before making investment decisions.
         """)
     
+    @ui_safe("Error rendering charts")
     def render_charts(self):
         """Render the interactive charts."""
         if self.current_data is None or self.current_data.empty:
@@ -355,32 +560,26 @@ class StockAnalyzerApp:
         
         st.markdown("### 📊 Technical Analysis Charts")
         
+        symbol = st.session_state.current_symbol
+        df_key = _df_key(self.current_data)
+        
         # Main candlestick chart
         st.markdown("#### Price Chart with Technical Indicators")
-        candlestick_fig = ChartCreator.create_candlestick_chart(
-            self.current_data, 
-            st.session_state.current_symbol
-        )
+        candlestick_fig = _make_candles(df_key, self.current_data, symbol)
         st.plotly_chart(candlestick_fig, use_container_width=True)
         
         # Technical indicators chart
         st.markdown("#### Technical Indicators")
-        indicators_fig = ChartCreator.create_technical_indicators_chart(
-            self.current_data, 
-            st.session_state.current_symbol
-        )
+        indicators_fig = _make_indicators(df_key, self.current_data, symbol)
         st.plotly_chart(indicators_fig, use_container_width=True)
         
         # Prediction chart
         if self.prediction_data is not None and isinstance(self.prediction_data.get('prediction'), (int, float)):
             st.markdown("#### Prediction Analysis")
-            prediction_fig = ChartCreator.create_prediction_chart(
-                self.current_data, 
-                self.prediction_data, 
-                st.session_state.current_symbol
-            )
+            prediction_fig = _make_prediction(df_key, self.current_data, self.prediction_data, symbol)
             st.plotly_chart(prediction_fig, use_container_width=True)
     
+    @ui_safe("Error rendering data table")
     def render_data_table(self):
         """Render the data table section."""
         if self.current_data is None or self.current_data.empty:
@@ -388,30 +587,22 @@ class StockAnalyzerApp:
         
         st.markdown("### 📋 Historical Data")
         
-        # Show last 10 rows by default
-        display_data = self.current_data.tail(10)
-        
-        # Format the data for display
-        display_data_formatted = display_data.copy()
-        for col in ['open', 'high', 'low', 'close', 'SMA20', 'SMA50']:
-            if col in display_data_formatted.columns:
-                display_data_formatted[col] = display_data_formatted[col].round(2)
-        
-        # Add date column back for display
-        display_data_formatted = display_data_formatted.reset_index()
-        if 'Date' in display_data_formatted.columns:
-            display_data_formatted['Date'] = display_data_formatted['Date'].dt.strftime('%Y-%m-%d')
-        elif 'date' in display_data_formatted.columns:
-            display_data_formatted['date'] = display_data_formatted['date'].dt.strftime('%Y-%m-%d')
+        # Show last 10 rows by default, rounding price columns in a single pass.
+        # The datetime index is kept as-is so Arrow ships it as timestamps and
+        # the column config formats it in the browser.
+        # Prices may be stored as float32, so widen them before rounding to
+        # keep values like 2500.12 from showing float32 noise.
+        price_columns = self.current_data.columns.intersection(['open', 'high', 'low', 'close', 'SMA20', 'SMA50'])
+        display_data = self.current_data.tail(10).astype({col: float for col in price_columns}).round({col: 2 for col in price_columns})
         
         st.dataframe(
-            display_data_formatted,
+            display_data,
             use_container_width=True,
-            hide_index=True
+            column_config={'_index': st.column_config.DatetimeColumn('Date', format='YYYY-MM-DD')}
         )
         
         # Download button
-        csv = self.current_data.to_csv()
+        csv = _df_to_csv(_df_key(self.current_data), self.current_data)
         st.download_button(
             label="📥 Download Data as CSV",
             data=csv,
@@ -419,42 +610,59 @@ class StockAnalyzerApp:
             mime="text/csv"
         )
     
+    @st.fragment
+    def render_data_sections(self):
+        """
+        Render the data-driven sections into placeholders.
+        
+        Runs as a fragment: Refresh re-fetches the data and re-populates the
+        placeholders in place instead of rerunning the whole script.
+        """
+        refresh = st.button("🔄 Refresh Data", type="primary")
+        
+        self._price_slot = st.empty()
+        self._prediction_slot = st.empty()
+        self._chart_slot = st.empty()
+        self._table_slot = st.empty()
+        
+        if refresh and not self.refresh_data():
+            return
+        
+        with self._price_slot.container():
+            self.render_price_summary()
+        
+        with self._prediction_slot.container():
+            self.render_prediction_section()
+        
+        with self._chart_slot.container():
+            self.render_charts()
+        
+        with self._table_slot.container():
+            self.render_data_table()
+    
+    @ui_safe("An unexpected error occurred")
     def run(self):
         """Main application loop."""
-        try:
-            # Render header
-            self.render_header()
-            
-            # Render sidebar
-            self.render_sidebar()
-            
-            # Main content area
-            if st.session_state.current_symbol:
-                # Fetch data
-                if self.fetch_stock_data(st.session_state.current_symbol, st.session_state.historical_days):
-                    # Render stock information
-                    self.render_stock_info()
-                    
-                    # Render price summary
-                    self.render_price_summary()
-                    
-                    # Render prediction section
-                    self.render_prediction_section()
-                    
-                    # Render charts
-                    self.render_charts()
-                    
-                    # Render data table
-                    self.render_data_table()
-                else:
-                    st.error("Failed to fetch stock data. Please check the symbol and try again.")
-                    st.info("💡 **Tip**: Try using symbols like RELIANCE.NS, AAPL, MSFT, or search for your stock on Yahoo Finance.")
+        # Render header
+        self.render_header()
+        
+        # Render sidebar
+        self.render_sidebar()
+        
+        # Main content area
+        if st.session_state.current_symbol:
+            # Fetch data
+            if self.fetch_stock_data(st.session_state.current_symbol, st.session_state.historical_days):
+                # Render stock information
+                self.render_stock_info()
+                
+                # Render price summary, prediction, charts and data table
+                self.render_data_sections()
             else:
-                st.info("Please enter a stock symbol in the sidebar to begin analysis.")
-        
-        except Exception as e:
-            st.error(f"An unexpected error occurred: {e}")
-            logger.error(f"Application error: {e}")
+                st.error("Failed to fetch stock data. Please check the symbol and try again.")
+                st.info("💡 **Tip**: Try using symbols like RELIANCE.NS, AAPL, MSFT, or search for your stock on Yahoo Finance.")
+        else:
+            st.info("Please enter a stock symbol in the sidebar to begin analysis.")
 
 def main():
     """Main function to run the application."""
@@ -4,14 +4,99 @@ from plotly.subplots import make_subplots
 import pandas as pd
 from typing import Dict, Optional
 import numpy as np
+import threading
+from collections import OrderedDict
+from functools import partial
+
+# Build traces as plain dicts: Plotly accepts them directly and validates each
+# property once, instead of again when a go.* object is copied into the figure.
+# Set to False to get eagerly validated trace objects while debugging a spec.
+PLOTLY_FAST = True
+
+_TRACE_CLASSES = {
+    'scatter': go.Scatter,
+    'scattergl': go.Scattergl,
+    'bar': go.Bar,
+    'candlestick': go.Candlestick
+}
+
+def _trace(trace_type: str, **props):
+    """Return a trace of the given type as a dict, or as a go.* object if not PLOTLY_FAST."""
+    if PLOTLY_FAST:
+        return dict(type=trace_type, **props)
+    return _TRACE_CLASSES[trace_type](**props)
+
+def _arr(series: pd.Series) -> np.ndarray:
+    """Contiguous float64 array, which Plotly serializes as a base64 typed array."""
+    return np.ascontiguousarray(series.to_numpy(), dtype=np.float64)
 
 class ChartCreator:
     """Class for creating interactive charts using Plotly."""
     
+    # Date arrays for recently charted indexes, keyed on id(index). The index
+    # itself is kept in the entry so a recycled id never matches another frame.
+    _DATES_CACHE_SIZE = 8
+    _dates_cache = OrderedDict()
+    _dates_lock = threading.Lock()
+    
+    # Series longer than this are drawn with WebGL unless use_webgl says otherwise.
+    # SVG stays fast up to a couple of thousand points per trace, so the app's
+    # daily ranges (at most about 250 bars) keep crisp SVG output
+    WEBGL_THRESHOLD = 2000
+    
+    # Unified hover recomputes across every trace on each mouse move, which
+    # freezes the browser on long series; fall back to 'closest' beyond this
+    UNIFIED_HOVER_MAX_POINTS = 5000
+    
+    @classmethod
+    def _scatter(cls, use_webgl: Optional[bool], n_points: int):
+        """Pick Scattergl or Scatter; None means WebGL only for long series."""
+        if use_webgl is None:
+            use_webgl = n_points > cls.WEBGL_THRESHOLD
+        return partial(_trace, 'scattergl' if use_webgl else 'scatter')
+    
+    @classmethod
+    def _hovermode(cls, n_points: int) -> str:
+        """Hover mode suited to a chart with n_points per trace."""
+        return 'x unified' if n_points < cls.UNIFIED_HOVER_MAX_POINTS else 'closest'
+    
+    @classmethod
+    def _dates(cls, index: pd.Index) -> np.ndarray:
+        """Return the index as a numpy array, reusing the conversion for the same index."""
+        key = id(index)
+        with cls._dates_lock:
+            cached = cls._dates_cache.get(key)
+            if cached is not None and cached[0] is index:
+                cls._dates_cache.move_to_end(key)
+                return cached[1]
+        
+        dates = index.to_numpy()
+        with cls._dates_lock:
+            cls._dates_cache[key] = (index, dates)
+            cls._dates_cache.move_to_end(key)
+            if len(cls._dates_cache) > cls._DATES_CACHE_SIZE:
+                cls._dates_cache.popitem(last=False)
+        return dates
+    
     @staticmethod
     def create_candlestick_chart(df: pd.DataFrame, symbol: str, 
-                                show_indicators: bool = True) -> go.Figure:
-        """Create an interactive candlestick chart with technical indicators."""
+                                show_indicators: bool = True,
+                                use_webgl: Optional[bool] = None,
+                                overlay_df: Optional[pd.DataFrame] = None) -> go.Figure:
+        """
+        Create an interactive candlestick chart with technical indicators.
+        
+        Indicator overlays are drawn from overlay_df when given (e.g. a
+        downsampled copy of df); the candles and volume always use df.
+        """
+        
+        # WebGL line traces render much faster than SVG for long series
+        scatter = ChartCreator._scatter(use_webgl, len(df))
+        overlay = df if overlay_df is None else overlay_df
+        
+        # Convert the dates once and share the array across every trace
+        dates = ChartCreator._dates(df.index)
+        overlay_dates = ChartCreator._dates(overlay.index)
         
         # Create subplots for price and volume
         fig = make_subplots(
@@ -22,108 +107,116 @@ class ChartCreator:
             row_width=[0.7, 0.3]
         )
         
+        # Traces are collected and added in one batch so Plotly validates and
+        # lays them out once rather than per trace
+        traces = []
+        rows = []
+        
         # Candlestick chart
-        fig.add_trace(
-            go.Candlestick(
-                x=df.index,
-                open=df['open'],
-                high=df['high'],
-                low=df['low'],
-                close=df['close'],
+        traces.append(
+            _trace(
+                'candlestick',
+                x=dates,
+                open=_arr(df['open']),
+                high=_arr(df['high']),
+                low=_arr(df['low']),
+                close=_arr(df['close']),
                 name='OHLC',
                 increasing_line_color='#26A69A',
                 decreasing_line_color='#EF5350'
-            ),
-            row=1, col=1
+            )
         )
+        rows.append(1)
         
         # Add technical indicators if available and requested
         if show_indicators:
             # SMA20
-            if 'SMA20' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['SMA20'],
+            if 'SMA20' in overlay.columns:
+                traces.append(
+                    scatter(
+                        x=overlay_dates,
+                        y=_arr(overlay['SMA20']),
                         mode='lines',
                         name='SMA20',
                         line=dict(color='#FF9800', width=2),
                         opacity=0.8
-                    ),
-                    row=1, col=1
+                    )
                 )
+                rows.append(1)
             
             # SMA50
-            if 'SMA50' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['SMA50'],
+            if 'SMA50' in overlay.columns:
+                traces.append(
+                    scatter(
+                        x=overlay_dates,
+                        y=_arr(overlay['SMA50']),
                         mode='lines',
                         name='SMA50',
                         line=dict(color='#2196F3', width=2),
                         opacity=0.8
-                    ),
-                    row=1, col=1
+                    )
                 )
+                rows.append(1)
             
             # Bollinger Bands
-            if all(col in df.columns for col in ['BB_Upper', 'BB_Middle', 'BB_Lower']):
+            if all(col in overlay.columns for col in ['BB_Upper', 'BB_Middle', 'BB_Lower']):
                 # Upper band
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Upper'],
+                traces.append(
+                    scatter(
+                        x=overlay_dates,
+                        y=_arr(overlay['BB_Upper']),
                         mode='lines',
                         name='BB Upper',
                         line=dict(color='rgba(255, 193, 7, 0.5)', width=1),
                         showlegend=False
-                    ),
-                    row=1, col=1
+                    )
                 )
+                rows.append(1)
                 
                 # Middle band
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Middle'],
+                traces.append(
+                    scatter(
+                        x=overlay_dates,
+                        y=_arr(overlay['BB_Middle']),
                         mode='lines',
                         name='BB Middle',
                         line=dict(color='rgba(255, 193, 7, 0.3)', width=1),
                         showlegend=False
-                    ),
-                    row=1, col=1
+                    )
                 )
+                rows.append(1)
                 
                 # Lower band
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Lower'],
+                traces.append(
+                    scatter(
+                        x=overlay_dates,
+                        y=_arr(overlay['BB_Lower']),
                         mode='lines',
                         name='BB Lower',
                         line=dict(color='rgba(255, 193, 7, 0.5)', width=1),
                         fill='tonexty',
                         fillcolor='rgba(255, 193, 7, 0.1)',
                         showlegend=False
-                    ),
-                    row=1, col=1
+                    )
                 )
+                rows.append(1)
         
         # Volume chart
-        colors = ['#26A69A' if close >= open else '#EF5350' 
-                 for close, open in zip(df['close'], df['open'])]
+        colors = np.where(df['close'].to_numpy() >= df['open'].to_numpy(), '#26A69A', '#EF5350')
         
-        fig.add_trace(
-            go.Bar(
-                x=df.index,
-                y=df['volume'],
+        traces.append(
+            _trace(
+                'bar',
+                x=dates,
+                y=_arr(df['volume']),
                 name='Volume',
                 marker_color=colors,
                 opacity=0.7
-            ),
-            row=2, col=1
+            )
         )
+        rows.append(2)
+        
+        fig.add_traces(traces, rows=rows, cols=[1] * len(traces))
         
         # Update layout
         fig.update_layout(
@@ -131,7 +224,7 @@ class ChartCreator:
             xaxis_rangeslider_visible=False,
             height=700,
             template='plotly_white',
-            hovermode='x unified',
+            hovermode=ChartCreator._hovermode(len(df)),
             legend=dict(
                 orientation="h",
                 yanchor="bottom",
@@ -149,9 +242,13 @@ class ChartCreator:
         return fig
     
     @staticmethod
-    def create_technical_indicators_chart(df: pd.DataFrame, symbol: str) -> go.Figure:
+    def create_technical_indicators_chart(df: pd.DataFrame, symbol: str,
+                                          use_webgl: Optional[bool] = None) -> go.Figure:
         """Create a separate chart for technical indicators."""
         
+        scatter = ChartCreator._scatter(use_webgl, len(df))
+        dates = ChartCreator._dates(df.index)
+        
         fig = make_subplots(
             rows=3, cols=1,
             shared_xaxes=True,
@@ -160,79 +257,89 @@ class ChartCreator:
             row_width=[0.33, 0.33, 0.34]
         )
         
+        traces = []
+        rows = []
+        
         # RSI
         if 'RSI' in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['RSI'],
+            traces.append(
+                scatter(
+                    x=dates,
+                    y=_arr(df['RSI']),
                     mode='lines',
                     name='RSI',
                     line=dict(color='#9C27B0', width=2)
-                ),
-                row=1, col=1
+                )
             )
-            
-            # Add RSI overbought/oversold lines
-            fig.add_hline(y=70, line_dash="dash", line_color="red", 
-                         annotation_text="Overbought (70)", row=1, col=1)
-            fig.add_hline(y=30, line_dash="dash", line_color="green", 
-                         annotation_text="Oversold (30)", row=1, col=1)
-            fig.add_hline(y=50, line_dash="dash", line_color="gray", 
-                         annotation_text="Neutral (50)", row=1, col=1)
+            rows.append(1)
         
         # MACD
         if all(col in df.columns for col in ['MACD', 'MACD_Signal', 'MACD_Histogram']):
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['MACD'],
+            traces.append(
+                scatter(
+                    x=dates,
+                    y=_arr(df['MACD']),
                     mode='lines',
                     name='MACD',
                     line=dict(color='#2196F3', width=2)
-                ),
-                row=2, col=1
+                )
             )
+            rows.append(2)
             
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['MACD_Signal'],
+            traces.append(
+                scatter(
+                    x=dates,
+                    y=_arr(df['MACD_Signal']),
                     mode='lines',
                     name='MACD Signal',
                     line=dict(color='#FF9800', width=2)
-                ),
-                row=2, col=1
+                )
             )
+            rows.append(2)
             
             # MACD Histogram
-            colors = ['#26A69A' if val >= 0 else '#EF5350' 
-                     for val in df['MACD_Histogram']]
+            colors = np.where(df['MACD_Histogram'].to_numpy() >= 0, '#26A69A', '#EF5350')
             
-            fig.add_trace(
-                go.Bar(
-                    x=df.index,
-                    y=df['MACD_Histogram'],
+            traces.append(
+                _trace(
+                    'bar',
+                    x=dates,
+                    y=_arr(df['MACD_Histogram']),
                     name='MACD Histogram',
                     marker_color=colors,
                     opacity=0.7
-                ),
-                row=2, col=1
+                )
             )
+            rows.append(2)
         
         # Volume Analysis
         if 'Volume_Ratio' in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['Volume_Ratio'],
+            traces.append(
+                scatter(
+                    x=dates,
+                    y=_arr(df['Volume_Ratio']),
                     mode='lines',
                     name='Volume Ratio',
                     line=dict(color='#4CAF50', width=2)
-                ),
-                row=3, col=1
+                )
             )
-            
+            rows.append(3)
+        
+        if traces:
+            fig.add_traces(traces, rows=rows, cols=[1] * len(traces))
+        
+        # Reference lines go in after the traces: add_hline skips subplots
+        # that are still empty
+        if 'RSI' in df.columns:
+            # Add RSI overbought/oversold lines
+            fig.add_hline(y=70, line_dash="dash", line_color="red", 
+                         annotation_text="Overbought (70)", row=1, col=1)
+            fig.add_hline(y=30, line_dash="dash", line_color="green", 
+                         annotation_text="Oversold (30)", row=1, col=1)
+            fig.add_hline(y=50, line_dash="dash", line_color="gray", 
+                         annotation_text="Neutral (50)", row=1, col=1)
+        
+        if 'Volume_Ratio' in df.columns:
             # Add volume ratio reference line
             fig.add_hline(y=1, line_dash="dash", line_color="gray", 
                          annotation_text="Average Volume (1.0)", row=3, col=1)
@@ -240,9 +347,10 @@ class ChartCreator:
         # Update layout
         fig.update_layout(
             title=f'{symbol} - Technical Indicators',
+            xaxis_rangeslider_visible=False,
             height=800,
             template='plotly_white',
-            hovermode='x unified',
+            hovermode=ChartCreator._hovermode(len(df)),
             showlegend=True
         )
         
@@ -302,22 +410,27 @@ class ChartCreator:
         return fig
     
     @staticmethod
-    def create_prediction_chart(df: pd.DataFrame, prediction_data: Dict, symbol: str) -> go.Figure:
+    def create_prediction_chart(df: pd.DataFrame, prediction_data: Dict, symbol: str,
+                                use_webgl: Optional[bool] = None) -> go.Figure:
         """Create a chart showing the prediction analysis."""
         
         if not prediction_data or 'prediction' not in prediction_data:
             return go.Figure()
         
-        # Get the last few data points for trend visualization
-        recent_data = df.tail(30)
+        # Get the last few data points for trend visualization, sliced once
+        recent_dates = df.index[-30:]
+        recent_close = _arr(df['close'])[-30:]
+        last_date = recent_dates[-1]
+        last_close = recent_close[-1]
+        scatter = ChartCreator._scatter(use_webgl, len(recent_close))
         
         fig = go.Figure()
         
         # Historical close prices
         fig.add_trace(
-            go.Scatter(
-                x=recent_data.index,
-                y=recent_data['close'],
+            scatter(
+                x=recent_dates.to_numpy(),
+                y=recent_close,
                 mode='lines+markers',
                 name='Historical Close',
                 line=dict(color='#2196F3', width=2)
@@ -327,11 +440,10 @@ class ChartCreator:
         # Add prediction point
         if isinstance(prediction_data['prediction'], (int, float)):
             # Add one more day for prediction
-            last_date = recent_data.index[-1]
             next_date = last_date + pd.Timedelta(days=1)
             
             fig.add_trace(
-                go.Scatter(
+                scatter(
                     x=[next_date],
                     y=[prediction_data['prediction']],
                     mode='markers',
@@ -345,12 +457,12 @@ class ChartCreator:
             )
             
             # Add trend line
-            if len(recent_data) >= 2:
-                x_trend = [recent_data.index[-1], next_date]
-                y_trend = [recent_data['close'].iloc[-1], prediction_data['prediction']]
+            if len(recent_close) >= 2:
+                x_trend = [last_date, next_date]
+                y_trend = [last_close, prediction_data['prediction']]
                 
                 fig.add_trace(
-                    go.Scatter(
+                    scatter(
                         x=x_trend,
                         y=y_trend,
                         mode='lines',
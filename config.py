@@ -29,6 +29,8 @@ class Config:
     
     # Cache settings
     CACHE_TTL = int(os.getenv('CACHE_TTL', '300'))  # 5 minutes
+    LIVE_PRICE_CACHE_TTL = int(os.getenv('LIVE_PRICE_CACHE_TTL', '60'))  # 1 minute
+    MARKET_DATA_CACHE_TTL = int(os.getenv('MARKET_DATA_CACHE_TTL', '3600'))  # 1 hour
     
     # Security settings
     ENABLE_DEBUG = os.getenv('ENABLE_DEBUG', 'false').lower() == 'true'
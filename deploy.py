@@ -8,6 +8,7 @@ import os
 import sys
 import subprocess
 import logging
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 from config import Config
 
@@ -53,11 +54,12 @@ def check_dependencies():
         'python-dotenv', 'requests', 'numpy', 'ta'
     ]
     
+    # Look up installed distribution metadata by PyPI name; nothing is imported
     missing_packages = []
     for package in required_packages:
         try:
-            __import__(package)
-        except ImportError:
+            distribution(package)
+        except PackageNotFoundError:
             missing_packages.append(package)
     
     if missing_packages:
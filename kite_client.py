@@ -4,12 +4,185 @@ from datetime import datetime, timedelta
 from kiteconnect import KiteConnect
 from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from datetime import time
+from time import monotonic
+
+from config import Config
+from utils import attach_indicators, ema, rolling_mean, rolling_mean_std, rsi_wilder, wilder_averages
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compact dtypes for the instruments dump: the low-cardinality text columns
+# become categoricals and the numeric ones get explicit widths
+_INSTRUMENT_DTYPES = {
+    'exchange': 'category',
+    'segment': 'category',
+    'instrument_type': 'category',
+    'instrument_token': 'int64',
+    'lot_size': 'int32'
+}
+
+# Most (symbol, days) histories a client keeps in memory; a long-running app
+# sees many symbols, and each entry holds a full indicator frame
+_HIST_CACHE_SIZE = 64
+
+# Kite publishes the instruments dump once a day, so a copy on disk named by
+# date lets a restarted process skip the multi-megabyte fetch
+_INSTRUMENTS_CACHE_DIR = Path('~/.cache').expanduser()
+
+def _instruments_cache_path(day) -> Path:
+    """Path of the on-disk instruments dump for the given date."""
+    return _INSTRUMENTS_CACHE_DIR / f"kite_instruments_{day:%Y%m%d}.parquet"
+
+def _instruments_frame(instruments: List[Dict]) -> pd.DataFrame:
+    """
+    Build the instruments DataFrame from Kite's dump with compact dtypes.
+    
+    expiry holds dates for derivatives and '' for everything else; coercing it
+    to datetime64 (NaT for the blanks) gives it a type parquet can store.
+    """
+    instruments_df = pd.DataFrame(instruments)
+    instruments_df = instruments_df.astype(
+        {col: dtype for col, dtype in _INSTRUMENT_DTYPES.items() if col in instruments_df.columns}
+    )
+    if 'expiry' in instruments_df.columns:
+        instruments_df['expiry'] = pd.to_datetime(instruments_df['expiry'], errors='coerce')
+    return instruments_df
+
+def _load_instruments(cache_path: Path) -> Optional[pd.DataFrame]:
+    """Read a day's instruments dump from disk, or None if unavailable."""
+    if not cache_path.exists():
+        return None
+    
+    try:
+        instruments_df = pd.read_parquet(cache_path)
+        logger.info(f"Loaded {len(instruments_df)} instruments from {cache_path}")
+        return instruments_df
+    except Exception as e:
+        logger.warning(f"Could not read instruments cache {cache_path}: {e}")
+        return None
+
+def _save_instruments(instruments_df: pd.DataFrame, cache_path: Path):
+    """Write the instruments dump to disk and remove older days' copies."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        instruments_df.to_parquet(cache_path, compression='zstd')
+        for old_path in cache_path.parent.glob('kite_instruments_*.parquet'):
+            if old_path != cache_path:
+                old_path.unlink(missing_ok=True)
+    except Exception as e:
+        # Without the file the next restart simply fetches the dump again
+        logger.warning(f"Could not write instruments cache {cache_path}: {e}")
+
+def _compute_indicators(close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute every technical indicator column from plain float64 arrays.
+    
+    Rolling windows come from cumulative sums and the recursions (EMA, Wilder)
+    from compiled EWM loops, so each indicator is a single linear pass with no
+    per-column Series construction.
+    
+    Args:
+        close: Closing prices
+        volume: Traded volumes
+    
+    Returns:
+        Dictionary of indicator name to array, aligned with the inputs
+    """
+    indicators = {}
+    
+    # Simple Moving Averages; SMA20 is also the Bollinger middle band
+    sma20, bb_std = rolling_mean_std(close, 20)
+    indicators['SMA20'] = sma20
+    indicators['SMA50'] = rolling_mean(close, 50)
+    
+    # MACD from the standard unadjusted EMAs; the EMAs themselves are
+    # only intermediates and are not kept as columns
+    macd = ema(close, 12) - ema(close, 26)
+    macd_signal = ema(macd, 9)
+    indicators['MACD'] = macd
+    indicators['MACD_Signal'] = macd_signal
+    indicators['MACD_Histogram'] = macd - macd_signal
+    
+    # RSI
+    indicators['RSI'] = rsi_wilder(close)
+    
+    # Bollinger Bands
+    indicators['BB_Middle'] = sma20
+    indicators['BB_Upper'] = sma20 + (bb_std * 2)
+    indicators['BB_Lower'] = sma20 - (bb_std * 2)
+    
+    # Volume indicators
+    volume_sma = rolling_mean(volume, 20)
+    indicators['Volume_SMA'] = volume_sma
+    indicators['Volume_Ratio'] = volume / volume_sma
+    
+    return indicators
+
+class _RollingWindow:
+    """
+    Fixed-size window with running sums, so mean and std update in O(1).
+    
+    The sums are kept over values shifted by the first one pushed, for the
+    same accuracy reason as utils.rolling_mean_std.
+    """
+    
+    def __init__(self, size: int, values=()):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        for value in values:
+            self.push(value)
+    
+    def push(self, value: float):
+        """Append a value, dropping the oldest once the window is full."""
+        if self.shift is None:
+            self.shift = value
+        value -= self.shift
+        if len(self.values) == self.size:
+            dropped = self.values[0]
+            self.total -= dropped
+            self.total_sq -= dropped * dropped
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+    
+    def mean(self) -> float:
+        """Mean of the window, NaN until it is full."""
+        if len(self.values) < self.size:
+            return np.nan
+        return self.total / self.size + self.shift
+    
+    def std(self) -> float:
+        """Sample standard deviation of the window, NaN until it is full."""
+        if len(self.values) < self.size:
+            return np.nan
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+class _Ewm:
+    """EMA matching pandas ewm(span=..., adjust=False).mean(), updated in O(1)."""
+    
+    def __init__(self, span: int, last_value: float = np.nan):
+        self.alpha = 2 / (span + 1)
+        self.value = last_value
+    
+    def push(self, value: float) -> float:
+        """Add an observation and return the updated average."""
+        if np.isnan(self.value):
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
 class KiteClient:
     """Wrapper class for Zerodha Kite Connect API operations."""
     
@@ -18,36 +191,58 @@ class KiteClient:
         self.kite = KiteConnect(api_key=api_key)
         self.kite.set_access_token(access_token)
         self._instruments_cache = None
+        self._token_index = {}
+        self._instruments_lock = threading.Lock()
         self._last_cache_update = None
+        self._indicator_state = {}
+        # symbol -> days of the history its indicator state was seeded from
+        self._indicator_source = {}
+        # (symbol, days) -> (fetched at, DataFrame) in least recently used
+        # order, expiring after Config.CACHE_TTL and capped at _HIST_CACHE_SIZE
+        self._hist_cache = OrderedDict()
+        self._hist_lock = threading.Lock()
     
     def get_instruments(self, force_refresh: bool = False) -> pd.DataFrame:
         """Get all instruments with caching for performance."""
         current_time = datetime.now()
         
-        # Refresh cache if forced or older than 1 hour
-        if (force_refresh or 
-            self._instruments_cache is None or 
-            self._last_cache_update is None or
-            (current_time - self._last_cache_update).seconds > 3600):
-            
-            try:
-                logger.info("Fetching instruments from Kite Connect...")
-                instruments = self.kite.instruments()
-                self._instruments_cache = pd.DataFrame(instruments)
-                self._last_cache_update = current_time
-                logger.info(f"Fetched {len(instruments)} instruments")
-            except Exception as e:
-                logger.error(f"Error fetching instruments: {e}")
-                if self._instruments_cache is None:
-                    raise
-                # Use cached data if available
+        # Serialised so concurrent fetches trigger a single refresh
+        with self._instruments_lock:
+            # Refresh cache if forced or older than 1 hour
+            if (force_refresh or
+                self._instruments_cache is None or
+                self._last_cache_update is None or
+                (current_time - self._last_cache_update).seconds > 3600):
+                
+                try:
+                    cache_path = _instruments_cache_path(current_time.date())
+                    instruments_df = None if force_refresh else _load_instruments(cache_path)
+                    
+                    if instruments_df is None:
+                        logger.info("Fetching instruments from Kite Connect...")
+                        instruments = self.kite.instruments()
+                        instruments_df = _instruments_frame(instruments)
+                        logger.info(f"Fetched {len(instruments)} instruments")
+                        _save_instruments(instruments_df, cache_path)
+                    
+                    # (exchange, tradingsymbol) -> token, so lookups skip a full scan;
+                    # built back to front so the first listing wins, as the old mask did
+                    keys = zip(instruments_df['exchange'].tolist(), instruments_df['tradingsymbol'].tolist())
+                    self._token_index = dict(reversed(list(zip(keys, instruments_df['instrument_token'].tolist()))))
+                    self._instruments_cache = instruments_df
+                    self._last_cache_update = current_time
+                except Exception as e:
+                    logger.error(f"Error fetching instruments: {e}")
+                    if self._instruments_cache is None:
+                        raise
+                    # Use cached data if available
         
         return self._instruments_cache
     
     def get_instrument_token(self, symbol: str) -> Optional[int]:
         """Get instrument token for a given symbol."""
         try:
-            instruments_df = self.get_instruments()
+            self.get_instruments()
             
             # Handle different symbol formats
             if ':' in symbol:
@@ -56,17 +251,12 @@ class KiteClient:
                 exchange = 'NSE'
                 trading_symbol = symbol
             
-            # Search for the instrument
-            instrument = instruments_df[
-                (instruments_df['exchange'] == exchange) & 
-                (instruments_df['tradingsymbol'] == trading_symbol)
-            ]
-            
-            if instrument.empty:
+            # Look up the instrument
+            token = self._token_index.get((exchange, trading_symbol))
+            if token is None:
                 logger.warning(f"Instrument not found for symbol: {symbol}")
                 return None
             
-            token = instrument.iloc[0]['instrument_token']
             logger.info(f"Found token {token} for symbol {symbol}")
             return token
             
@@ -74,8 +264,41 @@ class KiteClient:
             logger.error(f"Error getting instrument token for {symbol}: {e}")
             return None
     
+    def _cached_history(self, key: Tuple[str, int]) -> Optional[pd.DataFrame]:
+        """Return the cached frame for key if it is still fresh, else None."""
+        with self._hist_lock:
+            cached = self._hist_cache.get(key)
+            if cached is None:
+                return None
+            if monotonic() - cached[0] >= Config.CACHE_TTL:
+                del self._hist_cache[key]
+                return None
+            self._hist_cache.move_to_end(key)
+            return cached[1]
+    
+    def _store_history(self, key: Tuple[str, int], df: pd.DataFrame):
+        """Cache df under key, dropping expired entries and then the least recently used."""
+        now = monotonic()
+        with self._hist_lock:
+            self._hist_cache[key] = (now, df)
+            self._hist_cache.move_to_end(key)
+            expired = [k for k, (fetched_at, _) in self._hist_cache.items()
+                       if now - fetched_at >= Config.CACHE_TTL]
+            for k in expired:
+                del self._hist_cache[k]
+            while len(self._hist_cache) > _HIST_CACHE_SIZE:
+                self._hist_cache.popitem(last=False)
+    
     def get_historical_data(self, symbol: str, days: int = 60) -> Optional[pd.DataFrame]:
         """Fetch historical OHLCV data for a symbol."""
+        cached = self._cached_history((symbol, days))
+        if cached is not None:
+            # Streaming updates must continue the frame the caller gets back,
+            # so reseed when the state came from another days window
+            if self._indicator_source.get(symbol) != days:
+                self._seed_from(symbol, days, cached)
+            return cached.copy()
+        
         try:
             token = self.get_instrument_token(symbol)
             if token is None:
@@ -115,53 +338,132 @@ class KiteClient:
             
             # Calculate technical indicators
             df = self._calculate_technical_indicators(df)
+            self._seed_from(symbol, days, df)
+            self._store_history((symbol, days), df)
             
             logger.info(f"Successfully fetched {len(df)} days of data for {symbol}")
-            return df
+            return df.copy()
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return None
     
+    def get_historical_data_many(self, symbols: List[str], days: int = 60) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch historical data for several symbols concurrently.
+        
+        Args:
+            symbols: Symbols to fetch
+            days: Number of days of history per symbol
+        
+        Returns:
+            Dictionary mapping each symbol to its DataFrame (or None on failure)
+        """
+        if not symbols:
+            return {}
+        
+        # The Kite calls are I/O-bound, so threads overlap the network waits
+        max_workers = min(len(symbols), Config.MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda symbol: self.get_historical_data(symbol, days), symbols)
+            return dict(zip(symbols, results))
+    
     def _calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators for the data."""
         try:
-            # Simple Moving Averages
-            df['SMA20'] = df['close'].rolling(window=20).mean()
-            df['SMA50'] = df['close'].rolling(window=50).mean()
-            
-            # Exponential Moving Averages
-            df['EMA12'] = df['close'].ewm(span=12).mean()
-            df['EMA26'] = df['close'].ewm(span=26).mean()
-            
-            # MACD
-            df['MACD'] = df['EMA12'] - df['EMA26']
-            df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-            
-            # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Bollinger Bands
-            df['BB_Middle'] = df['close'].rolling(window=20).mean()
-            bb_std = df['close'].rolling(window=20).std()
-            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-            
-            # Volume indicators
-            df['Volume_SMA'] = df['volume'].rolling(window=20).mean()
-            df['Volume_Ratio'] = df['volume'] / df['Volume_SMA']
+            indicators = _compute_indicators(
+                df['close'].to_numpy(dtype=float),
+                df['volume'].to_numpy(dtype=float)
+            )
             
-            return df
+            return attach_indicators(df, indicators)
             
         except Exception as e:
             logger.error(f"Error calculating technical indicators: {e}")
             return df
     
+    def _seed_from(self, symbol: str, days: int, df: pd.DataFrame):
+        """Make df, fetched for the given days window, the base of symbol's streaming indicators."""
+        self._indicator_state[symbol] = self._seed_indicator_state(df)
+        self._indicator_source[symbol] = days
+    
+    def _seed_indicator_state(self, df: pd.DataFrame) -> Dict:
+        """Capture the running windows needed to extend df's indicators bar by bar."""
+        close = df['close'].to_numpy(dtype=float)
+        avg_gain, avg_loss = wilder_averages(close)
+        ema12 = ema(close, 12)[-1]
+        ema26 = ema(close, 26)[-1]
+        
+        return {
+            'last_close': close[-1],
+            'close20': _RollingWindow(20, close[-20:]),
+            'close50': _RollingWindow(50, close[-50:]),
+            'volume20': _RollingWindow(20, df['volume'].to_numpy(dtype=float)[-20:]),
+            'avg_gain': avg_gain[-1],
+            'avg_loss': avg_loss[-1],
+            'ema12': _Ewm(12, ema12),
+            'ema26': _Ewm(26, ema26),
+            'signal9': _Ewm(9, df['MACD_Signal'].iloc[-1])
+        }
+    
+    def update_indicators(self, symbol: str, new_bar: Dict) -> Optional[Dict]:
+        """
+        Extend a symbol's indicators by one bar without recomputing history.
+        
+        Args:
+            symbol: Symbol previously loaded through get_historical_data
+            new_bar: Bar with at least 'close' and 'volume'
+        
+        Returns:
+            Indicator values for the new bar, or None if the symbol has no state
+        """
+        state = self._indicator_state.get(symbol)
+        if state is None:
+            logger.warning(f"No indicator state for {symbol}; fetch historical data first")
+            return None
+        
+        close = float(new_bar['close'])
+        volume = float(new_bar['volume'])
+        delta = close - state['last_close']
+        state['last_close'] = close
+        
+        state['close20'].push(close)
+        state['close50'].push(close)
+        state['volume20'].push(volume)
+        # Wilder's smoothing over 14 bars
+        state['avg_gain'] = (state['avg_gain'] * 13 + max(delta, 0.0)) / 14
+        state['avg_loss'] = (state['avg_loss'] * 13 + max(-delta, 0.0)) / 14
+        
+        ema12 = state['ema12'].push(close)
+        ema26 = state['ema26'].push(close)
+        macd = ema12 - ema26
+        macd_signal = state['signal9'].push(macd)
+        
+        gain = state['avg_gain']
+        loss = state['avg_loss']
+        if loss == 0:
+            rsi = np.nan if gain == 0 else 100.0
+        else:
+            rsi = 100 - (100 / (1 + gain / loss))
+        
+        sma20 = state['close20'].mean()
+        bb_std = state['close20'].std()
+        volume_sma = state['volume20'].mean()
+        
+        return {
+            'SMA20': sma20,
+            'SMA50': state['close50'].mean(),
+            'MACD': macd,
+            'MACD_Signal': macd_signal,
+            'MACD_Histogram': macd - macd_signal,
+            'RSI': rsi,
+            'BB_Middle': sma20,
+            'BB_Upper': sma20 + (bb_std * 2),
+            'BB_Lower': sma20 - (bb_std * 2),
+            'Volume_SMA': volume_sma,
+            'Volume_Ratio': volume / volume_sma
+        }
+    
     def get_live_price(self, symbol: str) -> Optional[Dict]:
         """Get live price data for a symbol."""
         try:
@@ -228,11 +530,10 @@ class KiteClient:
             if df.empty or len(df) < 20:
                 return {'prediction': 'Insufficient data', 'confidence': 0}
             
-            # Get latest values
-            latest_close = df['close'].iloc[-1]
-            latest_sma20 = df['SMA20'].iloc[-1]
-            latest_sma50 = df['SMA50'].iloc[-1]
-            latest_rsi = df['RSI'].iloc[-1]
+            # Get latest values in one pass over the last row
+            latest_close, latest_sma20, latest_sma50, latest_rsi = (
+                df[['close', 'SMA20', 'SMA50', 'RSI']].to_numpy()[-1]
+            )
             
             # Simple trend analysis
             trend = 'Bullish' if latest_sma20 > latest_sma50 else 'Bearish'
@@ -7,19 +7,17 @@ This script provides an easy way to launch the demo application.
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
 
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import streamlit
-        import pandas
-        import plotly
-        import numpy
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("Please install dependencies: pip install -r requirements.txt")
-        return False
+    # Locate each package without importing it (no module init code runs)
+    for package in ('streamlit', 'pandas', 'plotly', 'numpy'):
+        if find_spec(package) is None:
+            print(f"❌ Missing dependency: No module named '{package}'")
+            print("Please install dependencies: pip install -r requirements.txt")
+            return False
+    return True
 
 def start_demo():
     """Start the demo application."""
@@ -41,6 +39,11 @@ def start_demo():
         cmd = [sys.executable, "-m", "streamlit", "run", demo_file]
         
         print(f"🔧 Running: {' '.join(cmd)}")
+        
+        # On POSIX, replace this process with Streamlit instead of forking a child
+        if os.name != 'nt':
+            sys.stdout.flush()
+            os.execv(cmd[0], cmd)
         subprocess.run(cmd)
         
         return True
@@ -8,17 +8,20 @@ import os
 import sys
 import subprocess
 import logging
-from config import Config
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format=Config.LOG_FORMAT
-)
 logger = logging.getLogger(__name__)
 
 def start_production_app():
     """Start the production Streamlit app with optimized settings."""
+    # Config loads .env, so it is only imported once the app is really starting
+    from config import Config
+    
+    # Configure logging
+    logging.basicConfig(
+        level=getattr(logging, Config.LOG_LEVEL),
+        format=Config.LOG_FORMAT
+    )
+    
     try:
         # Set production environment variables
         env = os.environ.copy()
@@ -48,6 +51,10 @@ def start_production_app():
             '--logger.level', Config.LOG_LEVEL,
         ]
         
+        # On POSIX, replace this process with Streamlit instead of forking a
+        # child: one interpreter fewer, and Streamlit receives signals directly
+        if os.name != 'nt':
+            os.execvpe(cmd[0], cmd, env)
         subprocess.run(cmd, env=env, check=True)
         
     except subprocess.CalledProcessError as e:
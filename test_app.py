@@ -6,13 +6,21 @@ This script tests all major components without requiring API credentials.
 
 import sys
 import os
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Sample data shared by the tests; it is deterministic, so build it once
+_SAMPLE = None
+
+def _sample_data():
+    """Return the shared sample DataFrame, generating it on first use."""
+    global _SAMPLE
+    if _SAMPLE is None:
+        from utils import generate_sample_stock_data
+        _SAMPLE = generate_sample_stock_data("NSE:RELIANCE", 60)
+    return _SAMPLE
+
 def test_imports():
     """Test if all required modules can be imported."""
     print("🔍 Testing module imports...")
@@ -59,10 +67,7 @@ def test_sample_data_generation():
     print("\n🔍 Testing sample data generation...")
     
     try:
-        from utils import generate_sample_stock_data
-        
-        # Generate sample data
-        df = generate_sample_stock_data("NSE:RELIANCE", 30)
+        df = _sample_data()
         
         if df.empty:
             print("❌ Sample data generation failed - empty DataFrame")
@@ -98,11 +103,9 @@ def test_chart_creation():
     print("\n🔍 Testing chart creation...")
     
     try:
-        from utils import generate_sample_stock_data
         from chart_utils import ChartCreator
         
-        # Generate sample data
-        df = generate_sample_stock_data("NSE:TCS", 20)
+        df = _sample_data()
         
         if df.empty:
             print("❌ Cannot test charts - no sample data")
@@ -143,6 +146,48 @@ def test_chart_creation():
         print(f"❌ Chart creation test failed: {e}")
         return False
 
+def test_lttb_downsampling():
+    """Test the LTTB downsampling used for the chart overlays."""
+    print("\n🔍 Testing LTTB downsampling...")
+    
+    try:
+        import numpy as np
+        from app import _lttb_indices
+        
+        rng = np.random.default_rng(0)
+        y = np.cumsum(rng.normal(size=1000))
+        # A lone spike the downsampled line should not smooth away
+        y[537] += 50.0
+        
+        for n_out in (3, 10, 400, 999):
+            kept = _lttb_indices(y, n_out)
+            if len(kept) != n_out:
+                print(f"❌ Expected {n_out} points, got {len(kept)}")
+                return False
+            if kept[0] != 0 or kept[-1] != len(y) - 1:
+                print(f"❌ Endpoints not kept for n_out={n_out}")
+                return False
+            if not np.all(np.diff(kept) > 0):
+                print(f"❌ Indices not strictly increasing for n_out={n_out}")
+                return False
+        print("✅ LTTB keeps the endpoints and returns n_out increasing indices")
+        
+        if 537 not in _lttb_indices(y, 100):
+            print("❌ LTTB dropped the spike")
+            return False
+        print("✅ LTTB keeps the spike")
+        
+        if not np.array_equal(_lttb_indices(y[:50], 400), np.arange(50)):
+            print("❌ Short series should be returned whole")
+            return False
+        print("✅ Short series are left as is")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ LTTB downsampling test failed: {e}")
+        return False
+
 def test_utility_functions():
     """Test utility functions."""
     print("\n🔍 Testing utility functions...")
@@ -175,6 +220,15 @@ def test_utility_functions():
             currency = format_currency(1234.56)
             percentage = format_percentage(0.05)
             print(f"✅ Formatting: {currency}, {percentage}")
+            
+            # Missing values, including pd.NA from nullable dtypes, format as zero
+            import pandas as pd
+            for missing in (None, float('nan'), pd.NA):
+                if (format_currency(missing) != "₹0.00" or format_percentage(missing) != "0.00%"
+                        or calculate_price_change(missing, 100) != {'change': 0.0, 'change_percent': 0.0}):
+                    print(f"❌ Formatting of missing value {missing!r} failed")
+                    return False
+            print("✅ Missing values format as zero")
         except Exception as e:
             print(f"❌ Formatting functions failed: {e}")
             return False
@@ -197,6 +251,325 @@ def test_utility_functions():
         print(f"❌ Utility functions test failed: {e}")
         return False
 
+def test_indicator_helpers():
+    """Test the shared indicator helpers against straightforward pandas versions."""
+    print("\n🔍 Testing indicator helpers...")
+    
+    try:
+        import numpy as np
+        import pandas as pd
+        from utils import ema, rolling_mean, rolling_mean_std, rsi_wilder
+        
+        rng = np.random.default_rng(7)
+        walk = 1 + np.cumsum(rng.normal(0, 0.01, 300))
+        gapped = 100 * walk
+        gapped[150] = np.nan
+        
+        # Low and very high price levels, and a gap the sums must not carry forward
+        for close in (100 * walk, 1e6 * walk, gapped):
+            rolling = pd.Series(close).rolling(20)
+            mean, std = rolling_mean_std(close, 20)
+            scale = np.nanmax(np.abs(close))
+            if not (np.allclose(mean, rolling.mean(), rtol=0, atol=1e-12 * scale, equal_nan=True)
+                    and np.allclose(std, rolling.std(), rtol=0, atol=1e-12 * scale, equal_nan=True)
+                    and np.allclose(rolling_mean(close, 50), pd.Series(close).rolling(50).mean(),
+                                    rtol=0, atol=1e-12 * scale, equal_nan=True)):
+                print(f"❌ Rolling mean/std differ from pandas at price level {scale:.0f}")
+                return False
+        print("✅ Rolling mean and std match pandas, including gaps and 1e6 prices")
+        
+        close = 100 * walk
+        for adjust in (False, True):
+            expected = pd.Series(close).ewm(span=12, adjust=adjust).mean()
+            if not np.allclose(ema(close, 12, adjust=adjust), expected, rtol=1e-12):
+                print(f"❌ EMA (adjust={adjust}) differs from pandas")
+                return False
+        print("✅ EMA matches pandas")
+        
+        # Wilder's RSI written out as the textbook loop
+        delta = np.diff(close)
+        avg_gain = np.maximum(delta[:14], 0).mean()
+        avg_loss = np.maximum(-delta[:14], 0).mean()
+        expected = [np.nan] * 14 + [100 - 100 / (1 + avg_gain / avg_loss)]
+        for move in delta[14:]:
+            avg_gain = (avg_gain * 13 + max(move, 0)) / 14
+            avg_loss = (avg_loss * 13 + max(-move, 0)) / 14
+            expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+        if not np.allclose(rsi_wilder(close), expected, rtol=1e-10, equal_nan=True):
+            print("❌ RSI differs from Wilder's recursion")
+            return False
+        print("✅ RSI matches Wilder's recursion")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Indicator helpers test failed: {e}")
+        return False
+
+def test_array_formatters():
+    """Test that the array formatters agree with the scalar ones."""
+    print("\n🔍 Testing array formatters...")
+    
+    try:
+        import numpy as np
+        from utils import (
+            format_currency, format_percentage, calculate_price_change,
+            format_currency_array, format_percentage_array, calculate_price_changes
+        )
+        
+        # Scale boundaries, the thousands-separator rounding edge, negatives and NaN
+        amounts = [0.0, 0.004, 12.5, 999.99, 999.995, 1000.0, 2900.15, 999999.0,
+                   1.5e6, 2.5e9, -1234.5, -0.5, float('nan')]
+        expected = [format_currency(amount) for amount in amounts]
+        if format_currency_array(amounts).tolist() != expected:
+            print("❌ format_currency_array differs from format_currency")
+            return False
+        print("✅ format_currency_array matches format_currency")
+        
+        fractions = [0.0, 0.05, -0.123456, 1.5, float('nan')]
+        expected = [format_percentage(value, 3) for value in fractions]
+        if format_percentage_array(fractions, 3).tolist() != expected:
+            print("❌ format_percentage_array differs from format_percentage")
+            return False
+        print("✅ format_percentage_array matches format_percentage")
+        
+        prices = [100.0, 110.0, 0.0, 5.0, float('nan'), 7.0, 7.7]
+        changes = calculate_price_changes(prices)
+        expected = [list(calculate_price_change(current, previous).values())
+                    for previous, current in zip(prices[:-1], prices[1:])]
+        if not np.array_equal(changes, np.array(expected)):
+            print("❌ calculate_price_changes differs from calculate_price_change")
+            return False
+        print("✅ calculate_price_changes matches calculate_price_change")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Array formatters test failed: {e}")
+        return False
+
+def test_data_export():
+    """Test exporting and reloading data as Parquet, Feather and CSV."""
+    print("\n🔍 Testing data export and load...")
+    
+    try:
+        import os
+        import tempfile
+        import pandas as pd
+        from utils import export_data_to_csv, load_data_from_csv
+        
+        df = _sample_data()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ("data.parquet", "data.feather", "data.csv"):
+                filename = os.path.join(tmp_dir, name)
+                if not export_data_to_csv(df, filename):
+                    print(f"❌ Export to {name} failed")
+                    return False
+                
+                loaded = load_data_from_csv(filename)
+                # CSV keeps no dtypes, so float32 columns come back as float64
+                exact = not name.endswith('.csv')
+                pd.testing.assert_frame_equal(
+                    loaded, df, check_dtype=exact, check_exact=exact,
+                    check_names=False, check_freq=False
+                )
+                print(f"✅ {name} round trip successful")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Data export test failed: {e}")
+        return False
+
+def test_yahoo_batch_history():
+    """Test batched Yahoo history, its disk cache and map_symbols without the network."""
+    print("\n🔍 Testing Yahoo batch history...")
+    
+    try:
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import numpy as np
+        import pandas as pd
+        import yfinance_client
+        
+        downloads = []
+        
+        def fake_download(tickers, **kwargs):
+            # Shaped like yf.download(group_by='ticker') for several tickers
+            downloads.append(list(tickers))
+            index = pd.date_range("2025-01-01", periods=80, freq="D")
+            frames = {}
+            for seed, ticker in enumerate(tickers):
+                close = 100 + np.random.default_rng(seed).normal(0, 1, 80).cumsum()
+                frames[ticker] = pd.DataFrame(
+                    {'Open': close, 'High': close + 1, 'Low': close - 1,
+                     'Close': close, 'Volume': np.full(80, 1000)},
+                    index=index
+                )
+            return pd.concat(frames.values(), axis=1, keys=frames.keys())
+        
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.object(yfinance_client, '_CACHE_DIR', Path(tmp_dir)), \
+                mock.patch.object(yfinance_client.yf, 'download', fake_download):
+            client = yfinance_client.YahooFinanceClient()
+            
+            # NSE:TCS and TCS.NS are the same Yahoo symbol and share one download
+            symbols = ["NSE:TCS", "TCS.NS", "NSE:INFY"]
+            results = client.get_historical_data_many(symbols, days=60)
+            if downloads != [["TCS.NS", "INFY.NS"]]:
+                print(f"❌ Unexpected downloads: {downloads}")
+                return False
+            if list(results) != symbols or any(df is None for df in results.values()):
+                print("❌ Missing batch results")
+                return False
+            pd.testing.assert_frame_equal(results["NSE:TCS"], results["TCS.NS"])
+            if not {'SMA20', 'RSI', 'MACD', 'ATR'}.issubset(results["NSE:INFY"].columns):
+                print("❌ Batch results lack technical indicators")
+                return False
+            print(f"✅ Batch download: {len(symbols)} symbols in {len(downloads)} request")
+            
+            # A second call within the TTL is served from the disk cache
+            cached = client.get_historical_data_many(symbols, days=60)
+            if len(downloads) != 1:
+                print("❌ Cached histories were downloaded again")
+                return False
+            pd.testing.assert_frame_equal(cached["NSE:INFY"], results["NSE:INFY"], check_freq=False)
+            print("✅ Repeat batch served from the disk cache")
+            
+            # The cache honours its TTL for both JSON and Parquet entries
+            disk_cache = yfinance_client._FileCache(Path(tmp_dir) / "extra")
+            disk_cache.put("X.NS", "info", {}, {'longName': 'X Ltd'})
+            if (disk_cache.get("X.NS", "info", {}, ttl=60) != {'longName': 'X Ltd'}
+                    or disk_cache.get("X.NS", "info", {}, ttl=0) is not None
+                    or disk_cache.get("X.NS", "info", {'other': 1}, ttl=60) is not None):
+                print("❌ File cache get/put mismatch")
+                return False
+            print("✅ File cache respects TTL and parameters")
+            
+            # map_symbols keeps the caller's order and runs every symbol once
+            mapped = client.map_symbols(client._get_symbol_mapping, ["NSE:TCS", "BSE:INFY", "RELIANCE"])
+            if mapped != {"NSE:TCS": "TCS.NS", "BSE:INFY": "INFY.BO", "RELIANCE": "RELIANCE.NS"}:
+                print(f"❌ map_symbols returned {mapped}")
+                return False
+            print("✅ map_symbols maps every symbol")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Yahoo batch history test failed: {e}")
+        return False
+
+def test_instruments_cache():
+    """Test the on-disk Kite instruments cache round trip."""
+    print("\n🔍 Testing instruments cache...")
+    
+    try:
+        import tempfile
+        from datetime import date
+        from pathlib import Path
+        import pandas as pd
+        
+        try:
+            from kite_client import _instruments_frame, _save_instruments, _load_instruments
+        except ImportError as e:
+            print(f"⚠️  Skipping instruments cache test: {e}")
+            return True
+        
+        # Kite's dump mixes expiry dates with '' for non-derivatives
+        instruments = [
+            {'instrument_token': 738561, 'tradingsymbol': 'RELIANCE', 'expiry': '',
+             'strike': 0.0, 'lot_size': 1, 'instrument_type': 'EQ',
+             'segment': 'NSE', 'exchange': 'NSE'},
+            {'instrument_token': 13238786, 'tradingsymbol': 'RELIANCE25OCTFUT',
+             'expiry': date(2025, 10, 30), 'strike': 0.0, 'lot_size': 500,
+             'instrument_type': 'FUT', 'segment': 'NFO-FUT', 'exchange': 'NFO'}
+        ]
+        instruments_df = _instruments_frame(instruments)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "kite_instruments_20251030.parquet"
+            _save_instruments(instruments_df, cache_path)
+            if not cache_path.exists():
+                print("❌ Instruments cache was not written")
+                return False
+            
+            loaded = _load_instruments(cache_path)
+        
+        pd.testing.assert_frame_equal(loaded, instruments_df)
+        print("✅ Instruments cache round trip successful")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Instruments cache test failed: {e}")
+        return False
+
+def test_streaming_indicators():
+    """Test that bar-by-bar Kite indicator updates match a full recomputation."""
+    print("\n🔍 Testing streaming indicators...")
+    
+    try:
+        import numpy as np
+        import pandas as pd
+        from unittest import mock
+        
+        try:
+            from kite_client import KiteClient
+        except ImportError as e:
+            print(f"⚠️  Skipping streaming indicators test: {e}")
+            return True
+        
+        # Creating the client makes no API call
+        client = KiteClient(api_key="test", access_token="test")
+        df = _sample_data()[['open', 'high', 'low', 'close', 'volume']]
+        
+        # Seed from all but the last bars, then stream those bars in
+        split = len(df) - 10
+        history = client._calculate_technical_indicators(df.iloc[:split].copy())
+        client._indicator_state["NSE:TEST"] = client._seed_indicator_state(history)
+        full = client._calculate_technical_indicators(df.copy())
+        
+        for i in range(split, len(df)):
+            bar = df.iloc[i]
+            streamed = client.update_indicators("NSE:TEST", {'close': bar['close'], 'volume': bar['volume']})
+            for column, value in streamed.items():
+                if not np.isclose(value, full[column].iloc[i], rtol=1e-9, atol=1e-9):
+                    print(f"❌ {column} differs at bar {i}: {value} vs {full[column].iloc[i]}")
+                    return False
+        
+        print(f"✅ {len(df) - split} streamed bars match the batch indicators")
+        
+        # A cached window must reseed the state when another window was fetched since
+        def historical_data(instrument_token, from_date, to_date, interval):
+            rows = df.iloc[-(to_date - from_date).days - 1:-1]
+            return rows.rename_axis('date').reset_index().to_dict('records')
+        
+        with mock.patch.object(client, 'get_instrument_token', return_value=1), \
+             mock.patch.object(client.kite, 'historical_data', side_effect=historical_data, create=True):
+            short = client.get_historical_data("NSE:TEST", 40)
+            client.get_historical_data("NSE:TEST", 55)
+            if client.get_historical_data("NSE:TEST", 40) is None:
+                print("❌ Cached history was not returned")
+                return False
+        
+        bar = df.iloc[-1]
+        streamed = client.update_indicators("NSE:TEST", {'close': bar['close'], 'volume': bar['volume']})
+        extended = client._calculate_technical_indicators(
+            pd.concat([short[['open', 'high', 'low', 'close', 'volume']], df.iloc[-1:]])
+        )
+        for column, value in streamed.items():
+            if not np.isclose(value, extended[column].iloc[-1], rtol=1e-9, atol=1e-9, equal_nan=True):
+                print(f"❌ {column} continues the wrong window: {value} vs {extended[column].iloc[-1]}")
+                return False
+        
+        print("✅ A cache hit reseeds the streaming state from its own window")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Streaming indicators test failed: {e}")
+        return False
+
 def test_configuration():
     """Test configuration loading."""
     print("\n🔍 Testing configuration...")
@@ -231,7 +604,14 @@ def run_all_tests():
         ("Module Imports", test_imports),
         ("Sample Data Generation", test_sample_data_generation),
         ("Chart Creation", test_chart_creation),
+        ("LTTB Downsampling", test_lttb_downsampling),
         ("Utility Functions", test_utility_functions),
+        ("Indicator Helpers", test_indicator_helpers),
+        ("Array Formatters", test_array_formatters),
+        ("Data Export", test_data_export),
+        ("Yahoo Batch History", test_yahoo_batch_history),
+        ("Instruments Cache", test_instruments_cache),
+        ("Streaming Indicators", test_streaming_indicators),
         ("Configuration", test_configuration)
     ]
     
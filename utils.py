@@ -1,15 +1,33 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as dt_time
 from typing import Dict, List, Optional, Tuple
 import logging
+import re
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Symbol validation tables, built once: a valid EXCHANGE:SYMBOL is accepted by
+# a single regex match and only rejects fall through to the detailed checks
+_VALID_EXCHANGES = ('NSE', 'BSE', 'NFO', 'CDS', 'MCX')
+_INVALID_SYMBOL_CHARS = frozenset('<>:"|?*/\\')
+_SYMBOL_RE = re.compile(r'(?:NSE|BSE|NFO|CDS|MCX):[^<>:"|?*/\\]{1,20}', re.IGNORECASE)
+
+# Daily return std -> annualized volatility in percent (252 trading days)
+_ANNUALIZED_VOLATILITY_PCT = float(np.sqrt(252)) * 100
+
+# Indian market trading session (regular hours)
+_MARKET_OPEN = dt_time(9, 15)
+_MARKET_CLOSE = dt_time(15, 30)
+
 def generate_sample_stock_data(symbol: str = "NSE:RELIANCE", days: int = 60) -> pd.DataFrame:
     """
     Generate sample stock data for testing and development purposes.
     
+    The data is deterministic for a given symbol, length and end date, so it
+    is built once and callers get their own copy of the cached frame.
+    
     Args:
         symbol: Stock symbol
         days: Number of days of data to generate
@@ -18,63 +36,208 @@ def generate_sample_stock_data(symbol: str = "NSE:RELIANCE", days: int = 60) ->
         DataFrame with OHLCV data and technical indicators
     """
     try:
-        # Generate date range
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
-        date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-        
-        # Generate base price data (starting from a realistic price)
-        base_price = 2500.0  # Starting price for Reliance
-        np.random.seed(42)  # For reproducible results
-        
-        # Generate price movements
-        returns = np.random.normal(0.001, 0.02, len(date_range))  # Daily returns
-        prices = [base_price]
-        
-        for ret in returns[1:]:
-            new_price = prices[-1] * (1 + ret)
-            prices.append(max(new_price, 100))  # Minimum price of 100
-        
-        # Create OHLCV data
-        data = []
-        for i, (date, close) in enumerate(zip(date_range, prices)):
-            # Generate realistic OHLC from close price
-            volatility = 0.02  # 2% daily volatility
-            
-            high = close * (1 + abs(np.random.normal(0, volatility)))
-            low = close * (1 - abs(np.random.normal(0, volatility)))
-            open_price = close * (1 + np.random.normal(0, volatility * 0.5))
-            
-            # Ensure OHLC relationship
-            high = max(high, open_price, close)
-            low = min(low, open_price, close)
-            
-            # Generate volume (correlated with price movement)
-            base_volume = 1000000  # Base volume
-            volume = int(base_volume * (1 + abs(returns[i]) * 10))
-            
-            data.append({
-                'date': date,
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(close, 2),
-                'volume': volume
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('date', inplace=True)
-        
-        # Calculate technical indicators
-        df = calculate_technical_indicators(df)
-        
-        logger.info(f"Generated sample data for {symbol}: {len(df)} days")
-        return df
+        return _sample_stock_data(symbol, days, datetime.now().date()).copy()
         
     except Exception as e:
         logger.error(f"Error generating sample data: {e}")
         return pd.DataFrame()
 
+@lru_cache(maxsize=64)
+def _sample_stock_data(symbol: str, days: int, end_date) -> pd.DataFrame:
+    """Build the sample frame ending on end_date (cached; do not mutate the result)."""
+    # Generate the daily index directly from day offsets
+    start_date = end_date - timedelta(days=days)
+    n = max(days + 1, 0)
+    dates = (np.datetime64(start_date, 'D') + np.arange(n)).astype('datetime64[ns]')
+    
+    # Generate base price data (starting from a realistic price)
+    base_price = 2500.0  # Starting price for Reliance
+    rng = np.random.default_rng(42)  # For reproducible results
+    
+    # Generate price movements; the first close is the base price itself
+    returns = rng.normal(0.001, 0.02, n)  # Daily returns
+    growth = 1 + returns
+    growth[:1] = 1.0
+    closes = np.maximum(base_price * np.cumprod(growth), 100)  # Minimum price of 100
+    
+    # Generate realistic OHLC from close prices
+    volatility = 0.02  # 2% daily volatility
+    high = closes * (1 + np.abs(rng.normal(0, volatility, n)))
+    low = closes * (1 - np.abs(rng.normal(0, volatility, n)))
+    open_prices = closes * (1 + rng.normal(0, volatility * 0.5, n))
+    
+    # Ensure OHLC relationship
+    high = np.maximum.reduce([high, open_prices, closes])
+    low = np.minimum.reduce([low, open_prices, closes])
+    
+    # Generate volume (correlated with price movement)
+    base_volume = 1000000  # Base volume
+    volume = (base_volume * (1 + np.abs(returns) * 10)).astype(np.int64)
+    
+    df = pd.DataFrame({
+        'open': np.round(open_prices, 2),
+        'high': np.round(high, 2),
+        'low': np.round(low, 2),
+        'close': np.round(closes, 2),
+        'volume': volume
+    }, index=pd.DatetimeIndex(dates, name='date'))
+    
+    # Calculate technical indicators
+    df = calculate_technical_indicators(df)
+    
+    logger.info(f"Generated sample data for {symbol}: {len(df)} days")
+    return df
+
+# Column order of the block written by calculate_technical_indicators
+INDICATOR_COLUMNS = [
+    'SMA20', 'SMA50', 'EMA12', 'EMA26', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'RSI', 'BB_Middle', 'BB_Upper', 'BB_Lower', 'Volume_SMA', 'Volume_Ratio'
+]
+
+# Indicator building blocks shared by calculate_technical_indicators and both
+# data clients; they take float64 arrays and return arrays aligned with them
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over window using one cumulative sum (NaN until full).
+    
+    As in rolling_mean_std, the sum runs over values shifted by the first
+    one, and input with NaNs goes through pandas' rolling instead.
+    """
+    if np.isnan(values).any():
+        return pd.Series(values).rolling(window).mean().to_numpy()
+    
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.cumsum(np.insert(values - values[0], 0, 0.0))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window + values[0]
+    return out
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing mean and sample std from one cumulative pass over (x, x^2).
+    
+    Values are shifted by the first one before summing; the std is unchanged
+    by the shift and the running sums stay small, which keeps the
+    E[x^2] - E[x]^2 form accurate at any price level. A NaN would be carried
+    by the sums into every later window, so input with gaps goes through
+    pandas' rolling instead, which only blanks the windows that hold one.
+    
+    Returns:
+        Tuple of (mean, std), NaN until the window is full
+    """
+    if np.isnan(values).any():
+        rolling = pd.Series(values).rolling(window)
+        return rolling.mean().to_numpy(), rolling.std().to_numpy()
+    
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) < window:
+        return mean, std
+    
+    shifted = values - values[0]
+    sums = np.zeros((len(values) + 1, 2))
+    np.cumsum(np.column_stack((shifted, shifted * shifted)), axis=0, out=sums[1:])
+    window_sums = (sums[window:] - sums[:-window]) / window
+    shifted_mean = window_sums[:, 0]
+    
+    # Population variance rescaled to the sample (ddof=1) variance
+    variance = (window_sums[:, 1] - shifted_mean * shifted_mean) * window / (window - 1)
+    mean[window - 1:] = shifted_mean + values[0]
+    std[window - 1:] = np.sqrt(np.maximum(variance, 0.0))
+    return mean, std
+
+def ema(values: np.ndarray, span: int, adjust: bool = False) -> np.ndarray:
+    """
+    Exponential moving average, run in pandas' compiled EWM loop.
+    
+    The default is the unadjusted trading recursion
+    ema[i] = alpha * x[i] + (1 - alpha) * ema[i - 1]; adjust=True gives
+    pandas' whole-history weighted form. The two converge after a few spans.
+    """
+    return pd.Series(values).ewm(span=span, adjust=adjust).mean().to_numpy()
+
+def wilder_averages(close: np.ndarray, period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average gain and loss with Wilder's smoothing, aligned to close.
+    
+    The first average is the simple mean of the first period moves; after that
+    avg = (prev * (period - 1) + move) / period, which is an unadjusted EWM
+    with alpha = 1 / period. Both are NaN for the first period bars.
+    """
+    avg_gain = np.full(len(close), np.nan)
+    avg_loss = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return avg_gain, avg_loss
+    
+    delta = np.diff(close)
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    gain[period - 1] = gain[:period].mean()
+    loss[period - 1] = loss[:period].mean()
+    
+    avg_gain[period:] = pd.Series(gain[period - 1:]).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    avg_loss[period:] = pd.Series(loss[period - 1:]).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return avg_gain, avg_loss
+
+def rsi_wilder(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI using Wilder's smoothing (NaN for the first period bars)."""
+    avg_gain, avg_loss = wilder_averages(close, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def attach_indicators(df: pd.DataFrame, indicators: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Return df with the indicator arrays appended as columns.
+    
+    One concat adds them all as a single block instead of one insert per
+    column; columns df already has under those names are replaced.
+    """
+    return pd.concat(
+        [df.drop(columns=list(indicators), errors='ignore'),
+         pd.DataFrame(indicators, index=df.index)],
+        axis=1
+    )
+
+def _compute_indicators(close: np.ndarray, volume: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Fill out (n x len(INDICATOR_COLUMNS)) with every indicator column.
+    
+    Args:
+        close: Closing prices as float64
+        volume: Volumes as float64
+        out: Preallocated float64 array written in INDICATOR_COLUMNS order
+    
+    Returns:
+        The filled out array
+    """
+    # Simple Moving Averages; SMA20 is the Bollinger middle band
+    sma20, bb_std = rolling_mean_std(close, 20)
+    out[:, 0] = sma20
+    out[:, 1] = rolling_mean(close, 50)
+    
+    # Exponential Moving Averages and MACD
+    out[:, 2] = ema(close, 12)
+    out[:, 3] = ema(close, 26)
+    out[:, 4] = out[:, 2] - out[:, 3]
+    out[:, 5] = ema(out[:, 4], 9)
+    out[:, 6] = out[:, 4] - out[:, 5]
+    
+    # RSI
+    out[:, 7] = rsi_wilder(close, 14)
+    
+    # Bollinger Bands
+    out[:, 8] = sma20
+    out[:, 9] = sma20 + 2 * bb_std
+    out[:, 10] = sma20 - 2 * bb_std
+    
+    # Volume indicators
+    out[:, 11] = rolling_mean(volume, 20)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, 12] = volume / out[:, 11]
+    
+    return out
+
 def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate technical indicators for the given DataFrame.
@@ -86,35 +249,15 @@ def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame with added technical indicators
     """
     try:
-        # Simple Moving Averages
-        df['SMA20'] = df['close'].rolling(window=20).mean()
-        df['SMA50'] = df['close'].rolling(window=50).mean()
-        
-        # Exponential Moving Averages
-        df['EMA12'] = df['close'].ewm(span=12).mean()
-        df['EMA26'] = df['close'].ewm(span=26).mean()
-        
-        # MACD
-        df['MACD'] = df['EMA12'] - df['EMA26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-        
-        # Volume indicators
-        df['Volume_SMA'] = df['volume'].rolling(window=20).mean()
-        df['Volume_Ratio'] = df['volume'] / df['Volume_SMA']
+        close = df['close'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        
+        # Every indicator lands in one preallocated block that is assigned
+        # to the frame in a single step. The math runs in float64 (the running
+        # sums need it) and the stored columns are float32, which is ample
+        # for charting and halves their memory; OHLC stays float64
+        values = _compute_indicators(close, volume, np.empty((len(df), len(INDICATOR_COLUMNS))))
+        df[INDICATOR_COLUMNS] = values.astype(np.float32)
         
         return df
         
@@ -136,6 +279,10 @@ def validate_stock_symbol(symbol: str) -> Tuple[bool, str]:
         if not symbol or not isinstance(symbol, str):
             return False, "Symbol must be a non-empty string"
         
+        # Fast path for well-formed symbols
+        if _SYMBOL_RE.fullmatch(symbol):
+            return True, ""
+        
         # Check format: EXCHANGE:SYMBOL
         if ':' not in symbol:
             return False, "Symbol must be in format: EXCHANGE:SYMBOL (e.g., NSE:RELIANCE)"
@@ -143,20 +290,18 @@ def validate_stock_symbol(symbol: str) -> Tuple[bool, str]:
         exchange, trading_symbol = symbol.split(':', 1)
         
         # Validate exchange
-        valid_exchanges = ['NSE', 'BSE', 'NFO', 'CDS', 'MCX']
-        if exchange.upper() not in valid_exchanges:
-            return False, f"Invalid exchange. Must be one of: {', '.join(valid_exchanges)}"
+        if exchange.upper() not in _VALID_EXCHANGES:
+            return False, f"Invalid exchange. Must be one of: {', '.join(_VALID_EXCHANGES)}"
         
         # Validate trading symbol
-        if not trading_symbol or len(trading_symbol) < 1:
+        if not trading_symbol:
             return False, "Trading symbol cannot be empty"
         
         if len(trading_symbol) > 20:
             return False, "Trading symbol too long (max 20 characters)"
         
         # Check for invalid characters
-        invalid_chars = ['<', '>', ':', '"', '|', '?', '*', '/', '\\']
-        if any(char in trading_symbol for char in invalid_chars):
+        if not _INVALID_SYMBOL_CHARS.isdisjoint(trading_symbol):
             return False, "Trading symbol contains invalid characters"
         
         return True, ""
@@ -176,22 +321,18 @@ def format_currency(amount: float, currency: str = "₹") -> str:
     Returns:
         Formatted currency string
     """
-    try:
-        if pd.isna(amount) or amount is None:
-            return f"{currency}0.00"
-        
-        if amount >= 1e9:  # Billions
-            return f"{currency}{amount/1e9:.2f}B"
-        elif amount >= 1e6:  # Millions
-            return f"{currency}{amount/1e6:.2f}M"
-        elif amount >= 1e3:  # Thousands
-            return f"{currency}{amount/1e3:.2f}K"
-        else:
-            return f"{currency}{amount:,.2f}"
-            
-    except Exception as e:
-        logger.error(f"Error formatting currency {amount}: {e}")
+    # None, NaN and pd.NA (from nullable dtypes) format as zero
+    if pd.isna(amount):
         return f"{currency}0.00"
+    
+    if amount >= 1e9:  # Billions
+        return f"{currency}{amount/1e9:.2f}B"
+    elif amount >= 1e6:  # Millions
+        return f"{currency}{amount/1e6:.2f}M"
+    elif amount >= 1e3:  # Thousands
+        return f"{currency}{amount/1e3:.2f}K"
+    else:
+        return f"{currency}{amount:,.2f}"
 
 def format_percentage(value: float, decimal_places: int = 2) -> str:
     """
@@ -204,15 +345,55 @@ def format_percentage(value: float, decimal_places: int = 2) -> str:
     Returns:
         Formatted percentage string
     """
-    try:
-        if pd.isna(value) or value is None:
-            return "0.00%"
-        
-        return f"{value * 100:+.{decimal_places}f}%"
-        
-    except Exception as e:
-        logger.error(f"Error formatting percentage {value}: {e}")
+    if pd.isna(value):
         return "0.00%"
+    
+    return f"{value * 100:+.{decimal_places}f}%"
+
+def format_currency_array(amounts, currency: str = "₹") -> np.ndarray:
+    """
+    Format a whole array of amounts the way format_currency formats one.
+    
+    Args:
+        amounts: Array-like of amounts (NaN formats as zero)
+        currency: Currency symbol
+    
+    Returns:
+        Array of formatted currency strings
+    """
+    values = np.asarray(amounts, dtype=float)
+    values = np.where(np.isnan(values), 0.0, values)
+    
+    # Pick each value's scale and suffix, then format all of them at once
+    conditions = [values >= 1e9, values >= 1e6, values >= 1e3]
+    scale = np.select(conditions, [1e9, 1e6, 1e3], default=1.0)
+    suffix = np.select(conditions, ['B', 'M', 'K'], default='')
+    formatted = np.char.add(np.char.mod(f'{currency}%.2f', values / scale), suffix)
+    
+    # %-formatting has no thousands separator; only unscaled values that
+    # round to 1,000 or more in magnitude need one, so those go the slow path
+    grouped = (scale == 1.0) & (np.abs(values) >= 999.995)
+    if grouped.any():
+        formatted = formatted.astype(object)
+        formatted[grouped] = [f"{currency}{amount:,.2f}" for amount in values[grouped]]
+        formatted = formatted.astype(str)
+    
+    return formatted
+
+def format_percentage_array(values, decimal_places: int = 2) -> np.ndarray:
+    """
+    Format a whole array of fractions the way format_percentage formats one.
+    
+    Args:
+        values: Array-like of fractions (0.05 for 5%); NaN formats as 0.00%
+        decimal_places: Number of decimal places
+    
+    Returns:
+        Array of formatted percentage strings
+    """
+    values = np.asarray(values, dtype=float)
+    formatted = np.char.mod(f'%+.{decimal_places}f%%', values * 100)
+    return np.where(np.isnan(values), "0.00%", formatted)
 
 def calculate_price_change(current: float, previous: float) -> Dict[str, float]:
     """
@@ -225,21 +406,39 @@ def calculate_price_change(current: float, previous: float) -> Dict[str, float]:
     Returns:
         Dictionary with change amount and percentage
     """
-    try:
-        if pd.isna(current) or pd.isna(previous) or previous == 0:
-            return {'change': 0.0, 'change_percent': 0.0}
-        
-        change = current - previous
-        change_percent = (change / previous) * 100
-        
-        return {
-            'change': round(change, 2),
-            'change_percent': round(change_percent, 2)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error calculating price change: {e}")
+    if pd.isna(current) or pd.isna(previous) or previous == 0:
         return {'change': 0.0, 'change_percent': 0.0}
+    
+    change = current - previous
+    change_percent = (change / previous) * 100
+    
+    return {
+        'change': round(change, 2),
+        'change_percent': round(change_percent, 2)
+    }
+
+def calculate_price_changes(prices) -> np.ndarray:
+    """
+    Calculate bar-to-bar price changes for a whole price series at once.
+    
+    Args:
+        prices: Array-like of prices in time order
+    
+    Returns:
+        Array of shape (len(prices) - 1, 2) holding the change amount and
+        percentage for each bar after the first; pairs with a missing or
+        zero previous price get 0.0 for both, as calculate_price_change does
+    """
+    prices = np.asarray(prices, dtype=float)
+    previous = prices[:-1]
+    current = prices[1:]
+    
+    valid = ~(np.isnan(previous) | np.isnan(current)) & (previous != 0)
+    change = np.where(valid, current - previous, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_percent = np.where(valid, change / previous * 100, 0.0)
+    
+    return np.column_stack((change, change_percent)).round(2)
 
 def get_market_hours() -> Dict[str, str]:
     """
@@ -264,11 +463,7 @@ def is_market_open() -> bool:
         True if market is open, False otherwise
     """
     try:
-        current_time = datetime.now().time()
-        market_open = datetime.strptime('09:15', '%H:%M').time()
-        market_close = datetime.strptime('15:30', '%H:%M').time()
-        
-        return market_open <= current_time <= market_close
+        return _MARKET_OPEN <= datetime.now().time() <= _MARKET_CLOSE
         
     except Exception as e:
         logger.error(f"Error checking market status: {e}")
@@ -283,10 +478,10 @@ def get_next_market_open() -> datetime:
     """
     try:
         current_time = datetime.now()
-        market_open = current_time.replace(hour=9, minute=15, second=0, microsecond=0)
+        market_open = datetime.combine(current_time.date(), _MARKET_OPEN)
         
         # If market is already open today, get next day
-        if current_time.time() >= datetime.strptime('09:15', '%H:%M').time():
+        if current_time.time() >= _MARKET_OPEN:
             market_open += timedelta(days=1)
         
         # Skip weekends (Saturday = 5, Sunday = 6)
@@ -313,41 +508,45 @@ def create_summary_stats(df: pd.DataFrame) -> Dict[str, float]:
         if df.empty:
             return {}
         
-        stats = {
-            'total_return': 0.0,
-            'volatility': 0.0,
-            'max_price': 0.0,
-            'min_price': 0.0,
-            'avg_volume': 0.0,
-            'price_range': 0.0
-        }
+        close = df['close'].to_numpy(dtype=float)
+        total_return = 0.0
+        volatility = 0.0
         
-        if len(df) > 1:
-            # Calculate returns
-            returns = df['close'].pct_change().dropna()
-            stats['total_return'] = ((df['close'].iloc[-1] / df['close'].iloc[0]) - 1) * 100
-            stats['volatility'] = returns.std() * np.sqrt(252) * 100  # Annualized volatility
+        if len(close) > 1:
+            # Calculate returns straight from the close array
+            returns = np.diff(close) / close[:-1]
+            total_return = (close[-1] / close[0] - 1) * 100
+            # A single return has no sample std (NaN, as pandas gives)
+            volatility = np.nanstd(returns, ddof=1) * _ANNUALIZED_VOLATILITY_PCT if len(returns) > 1 else np.nan
         
         # Price statistics
-        stats['max_price'] = df['high'].max()
-        stats['min_price'] = df['low'].min()
-        stats['price_range'] = stats['max_price'] - stats['min_price']
-        stats['avg_volume'] = df['volume'].mean()
+        max_price = np.nanmax(df['high'].to_numpy(dtype=float))
+        min_price = np.nanmin(df['low'].to_numpy(dtype=float))
         
-        # Round values
-        for key in stats:
-            if isinstance(stats[key], float):
-                stats[key] = round(stats[key], 2)
+        stats = {
+            'total_return': total_return,
+            'volatility': volatility,
+            'max_price': max_price,
+            'min_price': min_price,
+            'avg_volume': np.nanmean(df['volume'].to_numpy(dtype=float)),
+            'price_range': max_price - min_price
+        }
         
-        return stats
+        # Round values
+        return {key: round(float(value), 2) for key, value in stats.items()}
         
     except Exception as e:
         logger.error(f"Error creating summary stats: {e}")
         return {}
 
+# Extensions that select a binary columnar format instead of CSV
+_PARQUET_EXTENSIONS = ('.parquet', '.pq')
+_FEATHER_EXTENSIONS = ('.feather', '.arrow')
+
 def export_data_to_csv(df: pd.DataFrame, filename: str) -> bool:
     """
-    Export DataFrame to CSV file.
+    Export DataFrame to a file, as Parquet or Feather when the extension asks
+    for it and CSV otherwise.
     
     Args:
         df: DataFrame to export
@@ -357,7 +556,13 @@ def export_data_to_csv(df: pd.DataFrame, filename: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        df.to_csv(filename, index=True)
+        if filename.endswith(_PARQUET_EXTENSIONS):
+            df.to_parquet(filename, compression='zstd', index=True)
+        elif filename.endswith(_FEATHER_EXTENSIONS):
+            # Feather only stores columns, so the index travels as the first one
+            df.reset_index().to_feather(filename)
+        else:
+            df.to_csv(filename, index=True)
         logger.info(f"Data exported to {filename}")
         return True
         
@@ -367,7 +572,7 @@ def export_data_to_csv(df: pd.DataFrame, filename: str) -> bool:
 
 def load_data_from_csv(filename: str) -> pd.DataFrame:
     """
-    Load DataFrame from CSV file.
+    Load DataFrame from a CSV, Parquet or Feather file (chosen by extension).
     
     Args:
         filename: Input filename
@@ -376,10 +581,16 @@ def load_data_from_csv(filename: str) -> pd.DataFrame:
         Loaded DataFrame
     """
     try:
-        df = pd.read_csv(filename, index_col=0, parse_dates=True)
+        if filename.endswith(_PARQUET_EXTENSIONS):
+            df = pd.read_parquet(filename)
+        elif filename.endswith(_FEATHER_EXTENSIONS):
+            df = pd.read_feather(filename)
+            df = df.set_index(df.columns[0])
+        else:
+            df = pd.read_csv(filename, index_col=0, parse_dates=True)
         logger.info(f"Data loaded from {filename}")
         return df
         
     except Exception as e:
         logger.error(f"Error loading data from {filename}: {e}")
-        return pd.DataFrame() 
\ No newline at end of file
+        return pd.DataFrame()
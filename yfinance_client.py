@@ -1,35 +1,348 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from datetime import time as dt_time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
 import logging
+import os
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from config import Config
+from utils import attach_indicators, ema, rolling_mean, rolling_mean_std, rsi_wilder
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Map exchanges to Yahoo Finance suffixes
+_EXCHANGE_SUFFIXES = {
+    'NSE': '.NS',  # National Stock Exchange (India)
+    'BSE': '.BO',  # Bombay Stock Exchange (India)
+    'NYSE': '',    # New York Stock Exchange (US)
+    'NASDAQ': '',  # NASDAQ (US)
+    'LSE': '.L',   # London Stock Exchange (UK)
+    'TSE': '.T',   # Tokyo Stock Exchange (Japan)
+    'ASX': '.AX',  # Australian Securities Exchange
+}
+
+# OHLCV columns every history frame must have (after lower-casing)
+_REQUIRED_COLUMNS = frozenset({'open', 'high', 'low', 'close', 'volume'})
+
+# Suffixes that already mark a Yahoo symbol with its exchange
+_KNOWN_SUFFIXES = ('.NS', '.BO', '.L', '.T', '.AX')
+
+# Yahoo's chart endpoint serves about this many symbols per yf.download request
+_DOWNLOAD_BATCH_SIZE = 20
+
+# Responses that mean Yahoo is throttling or briefly failing, and the request
+# errors that wrap them or a dropped connection
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.RetryError,
+)
+
+# Largest price float32 still stores to within half a cent (spacing 2**-7)
+_FLOAT32_PRICE_LIMIT = 2.0 ** 17
+
+# Connections kept open per Yahoo host; yf.download and map_symbols fan out
+# across threads that all share one session
+_HTTP_POOL_SIZE = 32
+
+# Threads used to look up search candidates
+_SEARCH_WORKERS = 8
+
+# Responses are kept on disk so restarts and repeat runs skip Yahoo (and its
+# rate limits); company info changes rarely, price history within minutes
+_CACHE_DIR = Path('~/.cache').expanduser() / 'yfinance_client'
+_INFO_CACHE_TTL = 24 * 3600  # 1 day
+
+# Indian market trading session (regular hours, IST). Windows has no system
+# tz database without the tzdata package; IST has no DST, so a fixed offset
+# is an exact stand-in there
+try:
+    _IST = ZoneInfo('Asia/Kolkata')
+except ZoneInfoNotFoundError:
+    _IST = timezone(timedelta(hours=5, minutes=30), 'IST')
+_MARKET_OPEN = dt_time(9, 15)
+_MARKET_CLOSE = dt_time(15, 30)
+
+# Shortlist offered for quick selection in the app
+_POPULAR_STOCKS = (
+    {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'exchange': 'NSE'},
+    {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'exchange': 'NSE'},
+    {'symbol': 'INFY.NS', 'name': 'Infosys', 'exchange': 'NSE'},
+    {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'exchange': 'NSE'},
+    {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'exchange': 'NSE'},
+    {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'exchange': 'NSE'},
+    {'symbol': 'ITC.NS', 'name': 'ITC', 'exchange': 'NSE'},
+    {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'exchange': 'NSE'},
+    {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'exchange': 'NSE'},
+    {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'exchange': 'NSE'},
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'exchange': 'NASDAQ'},
+    {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'exchange': 'NASDAQ'},
+    {'symbol': 'GOOGL', 'name': 'Alphabet Inc.', 'exchange': 'NASDAQ'},
+    {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'exchange': 'NASDAQ'},
+    {'symbol': 'TSLA', 'name': 'Tesla Inc.', 'exchange': 'NASDAQ'},
+)
+
+def _downcast_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return df with the narrowest integer volume that fits, and float32 prices
+    when float32 can still hold them to the cent.
+    
+    float32 spacing is under a cent only below 2**17 (131,072); there every
+    price stays within half a cent and rounds back exactly. Frames with a
+    price at or above that (BRK-A trades near 700,000) keep float64 prices.
+    """
+    df = df.assign(volume=pd.to_numeric(df['volume'], downcast='integer'))
+    prices = ['open', 'high', 'low', 'close']
+    if np.nanmax(np.abs(df[prices].to_numpy(dtype=float)), initial=0.0) >= _FLOAT32_PRICE_LIMIT:
+        return df
+    return df.astype({col: np.float32 for col in prices})
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    Check whether a failed Yahoo call is worth another attempt.
+    
+    That is a throttled or failing server (HTTP 429/5xx, or the session's
+    Retry adapter giving up on those statuses) or a dropped or timed-out
+    connection; anything else, such as an unknown symbol, would fail again.
+    """
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    response = getattr(exc, 'response', None)
+    return getattr(response, 'status_code', None) in _RETRY_STATUSES
+
+def _rolling(values: np.ndarray, window: int, reducer: Callable) -> np.ndarray:
+    """
+    Apply reducer (e.g. min or max) to trailing windows (NaN until full).
+    
+    sliding_window_view gives every window as a strided view of the input, so
+    no window is copied.
+    """
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        out[..., window - 1:] = reducer(sliding_window_view(values, window, axis=-1))
+    return out
+
+def _compute_indicators(close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the close- and volume-based indicator columns from float64 arrays.
+    
+    Args:
+        close: Closing prices
+        volume: Traded volumes
+    
+    Returns:
+        Dictionary of indicator name to array, aligned with the inputs
+    """
+    indicators = {}
+    
+    # Simple Moving Averages; SMA20 doubles as the Bollinger middle band
+    sma20, bb_std = rolling_mean_std(close, 20)
+    indicators['SMA20'] = sma20
+    indicators['SMA50'] = rolling_mean(close, 50)
+    
+    # Exponential Moving Averages (pandas' adjusted form, as this client
+    # has always reported them)
+    ema12 = ema(close, 12, adjust=True)
+    ema26 = ema(close, 26, adjust=True)
+    indicators['EMA12'] = ema12
+    indicators['EMA26'] = ema26
+    
+    # MACD
+    macd = ema12 - ema26
+    macd_signal = ema(macd, 9, adjust=True)
+    indicators['MACD'] = macd
+    indicators['MACD_Signal'] = macd_signal
+    indicators['MACD_Histogram'] = macd - macd_signal
+    
+    # RSI
+    indicators['RSI'] = rsi_wilder(close)
+    
+    # Bollinger Bands
+    indicators['BB_Middle'] = sma20
+    indicators['BB_Upper'] = sma20 + (bb_std * 2)
+    indicators['BB_Lower'] = sma20 - (bb_std * 2)
+    
+    # Volume indicators
+    volume_sma = rolling_mean(volume, 20)
+    indicators['Volume_SMA'] = volume_sma
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators['Volume_Ratio'] = volume / volume_sma
+    
+    return indicators
+
+def _range_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      period: int = 14) -> Dict[str, np.ndarray]:
+    """
+    Compute ATR, Stochastic %K and Williams %R from float64 arrays.
+    
+    Stochastic and Williams share the same trailing extremes, so the rolling
+    low/high are taken once for both.
+    
+    Args:
+        high: High prices
+        low: Low prices
+        close: Closing prices
+        period: Lookback for all three indicators
+    
+    Returns:
+        Dictionary of indicator name to array, aligned with the inputs
+    """
+    # True range against the previous close; fmax skips the missing previous
+    # close on the first bar, as the row-wise max did
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    true_range = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    
+    lowest = _rolling(low, period, lambda w: w.min(axis=-1))
+    highest = _rolling(high, period, lambda w: w.max(axis=-1))
+    price_range = highest - lowest
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'ATR': rolling_mean(true_range, period),
+            'Stochastic_K': 100 * ((close - lowest) / price_range),
+            'Williams_R': -100 * ((highest - close) / price_range)
+        }
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may go out."""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class _FileCache:
+    """On-disk TTL cache: dicts as JSON, DataFrames as Parquet."""
+    
+    def __init__(self, root: Path):
+        self.root = root
+    
+    def _path(self, symbol: str, endpoint: str, params: Dict, ext: str) -> Path:
+        """File for (symbol, endpoint, params), named by a hash of the params."""
+        digest = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        safe_symbol = ''.join(ch if ch.isalnum() or ch in '.-_' else '_' for ch in symbol)
+        return self.root / safe_symbol / f"{endpoint}_{digest}.{ext}"
+    
+    def get(self, symbol: str, endpoint: str, params: Dict, ttl: float, as_frame: bool = False):
+        """
+        Return the cached value if younger than ttl seconds, else None.
+        
+        Args:
+            symbol: Symbol the value belongs to
+            endpoint: Kind of response (e.g. 'info', 'history')
+            params: Request parameters that distinguish cached values
+            ttl: Maximum age in seconds
+            as_frame: Whether the value is a DataFrame (Parquet) or a dict (JSON)
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        path = self._path(symbol, endpoint, params, 'parquet' if as_frame else 'json')
+        
+        try:
+            if time.time() - path.stat().st_mtime < ttl:
+                if as_frame:
+                    return pd.read_parquet(path)
+                with open(path, encoding='utf-8') as f:
+                    return json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read cache {path}: {e}")
+        
+        return None
+    
+    def put(self, symbol: str, endpoint: str, params: Dict, value, as_frame: bool = False):
+        """Store value for (symbol, endpoint, params); empty values are skipped."""
+        # Empty responses are not cached so the next call asks again
+        if value is None or len(value) == 0:
+            return
+        
+        path = self._path(symbol, endpoint, params, 'parquet' if as_frame else 'json')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            if as_frame:
+                value.to_parquet(tmp_path)
+            else:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(value, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # The disk copy is only an optimisation; carry on without it
+            logger.warning(f"Could not write cache {path}: {e}")
+    
+    def get_or_set(self, symbol: str, endpoint: str, params: Dict, ttl: float,
+                   loader: Callable, as_frame: bool = False):
+        """Return the cached value if fresh, else call loader and store its result."""
+        value = self.get(symbol, endpoint, params, ttl, as_frame)
+        if value is None:
+            value = loader()
+            self.put(symbol, endpoint, params, value, as_frame)
+        return value
+
 class YahooFinanceClient:
     """Client for fetching stock data using Yahoo Finance API."""
     
     def __init__(self):
         """Initialize the Yahoo Finance client with custom session."""
-        self._cache = {}
-        self._cache_timeout = 300
+        self._disk_cache = _FileCache(_CACHE_DIR)
+        
+        # Shared across threads so concurrent fetches stay under Yahoo's
+        # limits (roughly 60 price and 10 info requests a minute)
+        self._price_bucket = _TokenBucket(rate=60 / 60, capacity=60)
+        self._info_bucket = _TokenBucket(rate=10 / 60, capacity=10)
         
         # Create custom session with retry logic
         self.session = requests.Session()
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=sorted(_RETRY_STATUSES),
+        )
+        # Keep a warm keep-alive connection per worker thread (and per batch
+        # download thread) so concurrent fetches don't redo the TLS handshake
+        pool_size = max(_HTTP_POOL_SIZE, Config.MAX_CONCURRENT_REQUESTS)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry_strategy,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -42,7 +355,9 @@ class YahooFinanceClient:
             'Connection': 'keep-alive',
         })
     
-    def _get_symbol_mapping(self, symbol: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_symbol_mapping(symbol: str) -> str:
         """
         Convert user-friendly symbols to Yahoo Finance symbols.
         
@@ -52,35 +367,36 @@ class YahooFinanceClient:
         Returns:
             Yahoo Finance compatible symbol
         """
-        try:
-            # Handle different symbol formats
-            if ':' in symbol:
-                exchange, ticker = symbol.split(':', 1)
-                exchange = exchange.upper()
-                
-                # Map exchanges to Yahoo Finance suffixes
-                exchange_mapping = {
-                    'NSE': '.NS',  # National Stock Exchange (India)
-                    'BSE': '.BO',  # Bombay Stock Exchange (India)
-                    'NYSE': '',    # New York Stock Exchange (US)
-                    'NASDAQ': '',  # NASDAQ (US)
-                    'LSE': '.L',   # London Stock Exchange (UK)
-                    'TSE': '.T',   # Tokyo Stock Exchange (Japan)
-                    'ASX': '.AX',  # Australian Securities Exchange
-                }
-                
-                suffix = exchange_mapping.get(exchange, '.NS')  # Default to NSE
-                return f"{ticker}{suffix}"
-            
-            # If no exchange specified, assume NSE for Indian stocks
-            elif not any(symbol.endswith(ext) for ext in ['.NS', '.BO', '.L', '.T', '.AX']):
-                return f"{symbol}.NS"
-            
-            return symbol
-            
-        except Exception as e:
-            logger.error(f"Error mapping symbol {symbol}: {e}")
-            return symbol
+        # Handle different symbol formats
+        if ':' in symbol:
+            exchange, ticker = symbol.split(':', 1)
+            suffix = _EXCHANGE_SUFFIXES.get(exchange.upper(), '.NS')  # Default to NSE
+            return f"{ticker}{suffix}"
+        
+        # If no exchange specified, assume NSE for Indian stocks
+        if not symbol.endswith(_KNOWN_SUFFIXES):
+            return f"{symbol}.NS"
+        
+        return symbol
+    
+    def _ticker(self, yf_symbol: str) -> yf.Ticker:
+        """
+        yf.Ticker bound to this client's session.
+        
+        yfinance 0.2.x routes every request through one process-wide session
+        and replaces it whenever a call passes its own, so every yfinance call
+        here passes self.session; otherwise which session (and which retry and
+        pool settings) served a request would depend on the call order.
+        """
+        return yf.Ticker(yf_symbol, session=self.session)
+    
+    def _get_info(self, yf_symbol: str) -> Dict:
+        """ticker.info for yf_symbol, served from the disk cache when fresh."""
+        def fetch_info() -> Dict:
+            self._info_bucket.acquire()
+            return self._ticker(yf_symbol).info
+        
+        return self._disk_cache.get_or_set(yf_symbol, 'info', {}, _INFO_CACHE_TTL, fetch_info)
     
     def get_stock_info(self, symbol: str) -> Optional[Dict]:
         """
@@ -94,9 +410,7 @@ class YahooFinanceClient:
         """
         try:
             yf_symbol = self._get_symbol_mapping(symbol)
-            ticker = yf.Ticker(yf_symbol)
-            
-            info = ticker.info
+            info = self._get_info(yf_symbol)
             
             stock_info = {
                 'symbol': symbol,
@@ -128,34 +442,43 @@ class YahooFinanceClient:
             try:
                 yf_symbol = self._get_symbol_mapping(symbol)
                 
-                # Add random delay to avoid rate limiting
-                time.sleep(random.uniform(0.5, 2.0))
-                
-                # Calculate date range
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=days)
+                def fetch_history() -> pd.DataFrame:
+                    # Wait for the rate limiter rather than a fixed random delay
+                    self._price_bucket.acquire()
+                    
+                    # Calculate date range
+                    end_date = datetime.now()
+                    start_date = end_date - timedelta(days=days)
+                    
+                    logger.info(f"Fetching {days} days of data for {symbol} ({yf_symbol}) - Attempt {attempt + 1}")
+                    
+                    # Fetch data from Yahoo Finance
+                    ticker = self._ticker(yf_symbol)
+                    # Raise instead of returning an empty frame, so network
+                    # failures reach the retry below
+                    return ticker.history(start=start_date, end=end_date, interval=interval,
+                                          raise_errors=True)
                 
-                logger.info(f"Fetching {days} days of data for {symbol} ({yf_symbol}) - Attempt {attempt + 1}")
-                
-                # Fetch data from Yahoo Finance
-                ticker = yf.Ticker(yf_symbol)
-                df = ticker.history(start=start_date, end=end_date, interval=interval)
+                # Recent enough history comes from disk without touching Yahoo
+                df = self._disk_cache.get_or_set(
+                    yf_symbol, 'history', {'days': days, 'interval': interval},
+                    Config.CACHE_TTL, fetch_history, as_frame=True
+                )
                 
                 if df.empty:
                     logger.warning(f"No data found for {symbol}")
                     return None
                 
                 # Rename columns to match our standard format
-                df.columns = [col.lower() for col in df.columns]
+                df.rename(columns=str.lower, inplace=True)
                 
                 # Ensure we have the required columns
-                required_columns = ['open', 'high', 'low', 'close', 'volume']
-                if not all(col in df.columns for col in required_columns):
+                if not _REQUIRED_COLUMNS.issubset(df.columns):
                     logger.error(f"Missing required columns for {symbol}")
                     return None
                 
                 # Calculate technical indicators
-                df = self._calculate_technical_indicators(df)
+                df = self._calculate_technical_indicators(_downcast_ohlcv(df))
                 
                 logger.info(f"Successfully fetched {len(df)} days of data for {symbol}")
                 return df
@@ -163,6 +486,9 @@ class YahooFinanceClient:
             except Exception as e:
                 logger.error(f"Error fetching historical data for {symbol} (Attempt {attempt + 1}): {e}")
                 
+                if not _is_retryable(e):
+                    return None
+                
                 if attempt < max_retries - 1:
                     delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
                     logger.info(f"Retrying in {delay:.2f} seconds...")
@@ -173,6 +499,114 @@ class YahooFinanceClient:
         
         return None
     
+    def get_historical_data_many(self, symbols: List[str], days: int = 60,
+                                 interval: str = "1d") -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch historical data for several symbols with batched downloads.
+        
+        Args:
+            symbols: Symbols to fetch
+            days: Number of days of history per symbol
+            interval: Bar interval
+        
+        Returns:
+            Dictionary mapping each symbol to its DataFrame (or None on failure)
+        """
+        if not symbols:
+            return {}
+        
+        yf_symbols = {symbol: self._get_symbol_mapping(symbol) for symbol in symbols}
+        unique = list(dict.fromkeys(yf_symbols.values()))
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        params = {'days': days, 'interval': interval}
+        
+        # yf.download frames are tz-naive, adjusted and lack the Dividends /
+        # Stock Splits columns of Ticker.history, so they get their own
+        # cache endpoint rather than sharing 'history' with get_historical_data
+        endpoint = 'download'
+        
+        # Read every fresh cached history first, in parallel (Parquet reads
+        # release the GIL), so only the misses go to the network
+        max_workers = min(len(unique), Config.MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            cached = executor.map(
+                lambda yf_symbol: self._disk_cache.get(yf_symbol, endpoint, params, Config.CACHE_TTL, as_frame=True),
+                unique
+            )
+            frames = {yf_symbol: df for yf_symbol, df in zip(unique, cached) if df is not None}
+        missing = [yf_symbol for yf_symbol in unique if yf_symbol not in frames]
+        
+        # One rate-limited request per batch of symbols instead of one per symbol
+        for start in range(0, len(missing), _DOWNLOAD_BATCH_SIZE):
+            batch = missing[start:start + _DOWNLOAD_BATCH_SIZE]
+            self._price_bucket.acquire()
+            
+            logger.info(f"Fetching {days} days of data for {len(batch)} symbols")
+            try:
+                data = yf.download(
+                    tickers=batch, start=start_date, end=end_date, interval=interval,
+                    group_by='ticker', auto_adjust=True, threads=True,
+                    progress=False, session=self.session
+                )
+            except Exception as e:
+                logger.error(f"Error fetching historical data for {batch}: {e}")
+                continue
+            
+            for yf_symbol in batch:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if yf_symbol not in data.columns.get_level_values(0):
+                        continue
+                    df = data.xs(yf_symbol, axis=1, level=0)
+                else:
+                    df = data
+                
+                # The batch shares one index, so drop dates this symbol didn't trade
+                frames[yf_symbol] = df.dropna(how='all')
+                self._disk_cache.put(yf_symbol, endpoint, params, frames[yf_symbol], as_frame=True)
+        
+        results = {}
+        for symbol, yf_symbol in yf_symbols.items():
+            df = frames.get(yf_symbol)
+            if df is None or df.empty:
+                logger.warning(f"No data found for {symbol}")
+                results[symbol] = None
+                continue
+            
+            df = df.rename(columns=str.lower)
+            if not _REQUIRED_COLUMNS.issubset(df.columns):
+                logger.error(f"Missing required columns for {symbol}")
+                results[symbol] = None
+                continue
+            
+            results[symbol] = self._calculate_technical_indicators(_downcast_ohlcv(df))
+        
+        logger.info(f"Fetched historical data for {sum(df is not None for df in results.values())} of {len(results)} symbols")
+        return results
+    
+    def map_symbols(self, fn: Callable[[str], Any], symbols: List[str],
+                    max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Call fn for each symbol concurrently, e.g. client.get_live_price.
+        
+        The Yahoo calls are I/O-bound, so threads overlap the network waits;
+        the shared rate limiters keep the combined request rate in bounds.
+        
+        Args:
+            fn: Per-symbol function, such as a bound client method
+            symbols: Symbols to process
+            max_workers: Thread count (defaults to Config.MAX_CONCURRENT_REQUESTS)
+        
+        Returns:
+            Dictionary mapping each symbol to fn's result
+        """
+        if not symbols:
+            return {}
+        
+        max_workers = min(len(symbols), max_workers or Config.MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(symbols, executor.map(fn, symbols)))
+    
     def get_live_price(self, symbol: str) -> Optional[Dict]:
         """
         Get live/current price data for a symbol.
@@ -185,27 +619,31 @@ class YahooFinanceClient:
         """
         try:
             yf_symbol = self._get_symbol_mapping(symbol)
-            ticker = yf.Ticker(yf_symbol)
-            
-            # Get current info
-            info = ticker.info
+            ticker = self._ticker(yf_symbol)
             
             # Get recent data for price calculations
+            self._price_bucket.acquire()
             recent_data = ticker.history(period="2d")
             
             if recent_data.empty:
                 logger.warning(f"No recent data found for {symbol}")
                 return None
             
-            # Get the correct column names (yfinance returns capitalized column names)
-            close_col = 'Close' if 'Close' in recent_data.columns else 'close'
-            volume_col = 'Volume' if 'Volume' in recent_data.columns else 'volume'
-            high_col = 'High' if 'High' in recent_data.columns else 'high'
-            low_col = 'Low' if 'Low' in recent_data.columns else 'low'
-            open_col = 'Open' if 'Open' in recent_data.columns else 'open'
+            # Market cap and currency come from company info only if it is
+            # already cached; the info endpoint is the tightly rate-limited
+            # one, so a live quote never calls it. The chart response that
+            # history() just read carries the currency anyway
+            info = self._disk_cache.get(yf_symbol, 'info', {}, _INFO_CACHE_TTL) or {}
+            currency = info.get('currency') or ticker.get_history_metadata().get('currency', 'INR')
+            
+            # Map lower-case names to the actual columns once (yfinance returns
+            # capitalized column names) and read only the last bars
+            columns = {col.lower(): col for col in recent_data.columns}
+            latest = {name: recent_data[col].iat[-1] for name, col in columns.items()}
             
-            current_price = recent_data[close_col].iloc[-1]
-            previous_close = recent_data[close_col].iloc[-2] if len(recent_data) > 1 else current_price
+            closes = recent_data[columns['close']].to_numpy()
+            current_price = closes[-1]
+            previous_close = closes[-2] if len(closes) > 1 else current_price
             
             # Calculate change
             change = current_price - previous_close
@@ -217,13 +655,13 @@ class YahooFinanceClient:
                 'last_price': round(current_price, 2),
                 'change': round(change, 2),
                 'change_percent': round(change_percent, 2),
-                'volume': int(recent_data[volume_col].iloc[-1]) if volume_col in recent_data.columns else 0,
-                'high': round(recent_data[high_col].iloc[-1], 2) if high_col in recent_data.columns else current_price,
-                'low': round(recent_data[low_col].iloc[-1], 2) if low_col in recent_data.columns else current_price,
-                'open': round(recent_data[open_col].iloc[-1], 2) if open_col in recent_data.columns else current_price,
+                'volume': int(latest['volume']) if 'volume' in latest else 0,
+                'high': round(latest['high'], 2) if 'high' in latest else current_price,
+                'low': round(latest['low'], 2) if 'low' in latest else current_price,
+                'open': round(latest['open'], 2) if 'open' in latest else current_price,
                 'previous_close': round(previous_close, 2),
                 'market_cap': info.get('marketCap', 0),
-                'currency': info.get('currency', 'INR'),
+                'currency': currency,
                 'timestamp': datetime.now()
             }
             
@@ -243,14 +681,10 @@ class YahooFinanceClient:
         """
         try:
             # Get current time in IST (UTC+5:30)
-            current_time = datetime.utcnow() + timedelta(hours=5, minutes=30)
-            
-            # Indian market hours (9:15 AM - 3:30 PM IST)
-            market_open = current_time.replace(hour=9, minute=15, second=0, microsecond=0)
-            market_close = current_time.replace(hour=15, minute=30, second=0, microsecond=0)
+            current_time = datetime.now(_IST)
             
             # Check if market is open
-            is_market_open = market_open <= current_time <= market_close
+            is_market_open = _MARKET_OPEN <= current_time.time() <= _MARKET_CLOSE
             
             # Check if it's a weekday
             is_weekday = current_time.weekday() < 5  # Monday = 0, Friday = 4
@@ -259,8 +693,8 @@ class YahooFinanceClient:
                 'is_open': is_market_open and is_weekday,
                 'current_time': current_time.strftime('%H:%M:%S'),
                 'current_date': current_time.strftime('%Y-%m-%d'),
-                'market_open': market_open.strftime('%H:%M'),
-                'market_close': market_close.strftime('%H:%M'),
+                'market_open': _MARKET_OPEN.strftime('%H:%M'),
+                'market_close': _MARKET_CLOSE.strftime('%H:%M'),
                 'is_weekday': is_weekday,
                 'timezone': 'IST (UTC+5:30)'
             }
@@ -271,6 +705,22 @@ class YahooFinanceClient:
             logger.error(f"Error getting market status: {e}")
             return {'is_open': False, 'error': str(e)}
     
+    def _search_result(self, yf_symbol: str) -> Optional[Dict]:
+        """search_stocks row for one candidate symbol, or None if Yahoo has no info."""
+        try:
+            info = self._get_info(yf_symbol)
+        except Exception as e:
+            logger.warning(f"No info for search candidate {yf_symbol}: {e}")
+            return None
+        
+        return {
+            'symbol': yf_symbol,
+            'name': info.get('longName', info.get('shortName', yf_symbol)),
+            'exchange': info.get('exchange', 'Unknown'),
+            'country': info.get('country', 'Unknown'),
+            'sector': info.get('sector', 'Unknown')
+        }
+    
     def search_stocks(self, query: str, limit: int = 10) -> List[Dict]:
         """
         Search for stocks based on a query.
@@ -284,22 +734,13 @@ class YahooFinanceClient:
         """
         try:
             # Use yfinance's search functionality
-            search_results = yf.Tickers(query)
-            
-            stocks = []
-            for ticker in list(search_results.tickers)[:limit]:
-                try:
-                    info = ticker.info
-                    stock = {
-                        'symbol': ticker.ticker,
-                        'name': info.get('longName', info.get('shortName', ticker.ticker)),
-                        'exchange': info.get('exchange', 'Unknown'),
-                        'country': info.get('country', 'Unknown'),
-                        'sector': info.get('sector', 'Unknown')
-                    }
-                    stocks.append(stock)
-                except:
-                    continue
+            search_results = yf.Tickers(query, session=self.session)
+            
+            # Look the candidates up concurrently; info goes through the disk
+            # cache and the shared info rate limiter
+            rows = self.map_symbols(self._search_result, search_results.symbols[:limit],
+                                    max_workers=_SEARCH_WORKERS)
+            stocks = [stock for stock in rows.values() if stock is not None]
             
             logger.info(f"Found {len(stocks)} stocks matching '{query}'")
             return stocks
@@ -315,25 +756,7 @@ class YahooFinanceClient:
         Returns:
             List of popular stocks
         """
-        popular_stocks = [
-            {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'exchange': 'NSE'},
-            {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'exchange': 'NSE'},
-            {'symbol': 'INFY.NS', 'name': 'Infosys', 'exchange': 'NSE'},
-            {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'exchange': 'NSE'},
-            {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'exchange': 'NSE'},
-            {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'exchange': 'NSE'},
-            {'symbol': 'ITC.NS', 'name': 'ITC', 'exchange': 'NSE'},
-            {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'exchange': 'NSE'},
-            {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'exchange': 'NSE'},
-            {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'exchange': 'NSE'},
-            {'symbol': 'AAPL', 'name': 'Apple Inc.', 'exchange': 'NASDAQ'},
-            {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'exchange': 'NASDAQ'},
-            {'symbol': 'GOOGL', 'name': 'Alphabet Inc.', 'exchange': 'NASDAQ'},
-            {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'exchange': 'NASDAQ'},
-            {'symbol': 'TSLA', 'name': 'Tesla Inc.', 'exchange': 'NASDAQ'}
-        ]
-        
-        return popular_stocks
+        return list(_POPULAR_STOCKS)
     
     def _calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -346,87 +769,23 @@ class YahooFinanceClient:
             DataFrame with added technical indicators
         """
         try:
-            # Simple Moving Averages
-            df['SMA20'] = df['close'].rolling(window=20).mean()
-            df['SMA50'] = df['close'].rolling(window=50).mean()
-            
-            # Exponential Moving Averages
-            df['EMA12'] = df['close'].ewm(span=12).mean()
-            df['EMA26'] = df['close'].ewm(span=26).mean()
-            
-            # MACD
-            df['MACD'] = df['EMA12'] - df['EMA26']
-            df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-            
-            # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Bollinger Bands
-            df['BB_Middle'] = df['close'].rolling(window=20).mean()
-            bb_std = df['close'].rolling(window=20).std()
-            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-            
-            # Volume indicators
-            df['Volume_SMA'] = df['volume'].rolling(window=20).mean()
-            df['Volume_Ratio'] = df['volume'] / df['Volume_SMA']
+            # All close/volume indicators come from one pass over plain arrays
+            close = df['close'].to_numpy(dtype=float)
+            indicators = _compute_indicators(close, df['volume'].to_numpy(dtype=float))
             
             # Additional indicators
-            df['ATR'] = self._calculate_atr(df)
-            df['Stochastic_K'] = self._calculate_stochastic(df)
-            df['Williams_R'] = self._calculate_williams_r(df)
+            indicators.update(_range_indicators(
+                df['high'].to_numpy(dtype=float),
+                df['low'].to_numpy(dtype=float),
+                close
+            ))
             
-            return df
+            return attach_indicators(df, indicators)
             
         except Exception as e:
             logger.error(f"Error calculating technical indicators: {e}")
             return df
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average True Range."""
-        try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift())
-            tr3 = abs(low - close.shift())
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean()
-            
-            return atr
-        except:
-            return pd.Series(index=df.index)
-    
-    def _calculate_stochastic(self, df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> pd.Series:
-        """Calculate Stochastic Oscillator %K."""
-        try:
-            low_min = df['low'].rolling(window=k_period).min()
-            high_max = df['high'].rolling(window=k_period).max()
-            
-            k = 100 * ((df['close'] - low_min) / (high_max - low_min))
-            return k
-        except:
-            return pd.Series(index=df.index)
-    
-    def _calculate_williams_r(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Williams %R."""
-        try:
-            high_max = df['high'].rolling(window=period).max()
-            low_min = df['low'].rolling(window=period).min()
-            
-            wr = -100 * ((high_max - df['close']) / (high_max - low_min))
-            return wr
-        except:
-            return pd.Series(index=df.index)
-    
     def predict_next_day(self, df: pd.DataFrame) -> Dict:
         """
         Simple prediction using technical indicators.
@@ -441,13 +800,10 @@ class YahooFinanceClient:
             if df.empty or len(df) < 20:
                 return {'prediction': 'Insufficient data', 'confidence': 0}
             
-            # Get latest values
-            latest_close = df['close'].iloc[-1]
-            latest_sma20 = df['SMA20'].iloc[-1]
-            latest_sma50 = df['SMA50'].iloc[-1]
-            latest_rsi = df['RSI'].iloc[-1]
-            latest_macd = df['MACD'].iloc[-1]
-            latest_macd_signal = df['MACD_Signal'].iloc[-1]
+            # Get latest values in one pass over the last row
+            latest_close, latest_sma20, latest_sma50, latest_rsi, latest_macd, latest_macd_signal = (
+                df[['close', 'SMA20', 'SMA50', 'RSI', 'MACD', 'MACD_Signal']].to_numpy()[-1]
+            )
             
             # Simple trend analysis
             trend = 'Bullish' if latest_sma20 > latest_sma50 else 'Bearish'
@@ -481,7 +837,7 @@ class YahooFinanceClient:
                 confidence = 0.5
             
             return {
-                'prediction': round(prediction, 2),
+                'prediction': round(float(prediction), 2),
                 'trend': trend,
                 'rsi_signal': rsi_signal,
                 'macd_signal': macd_signal,